@@ -6116,7 +6116,7 @@ class TypeDecl(BaseTypeDecl):
             default_val=Entity.own_primitives_env(with_rebindings).singleton
         )
 
-    @langkit_property(return_type=LexicalEnv.array)
+    @langkit_property(return_type=LexicalEnv.array, memoized=True)
     def primitives_envs(with_rebindings=T.EnvRebindings,
                         stop_at=BaseTypeDecl.entity.array,
                         include_self=(Bool, False)):
@@ -6157,10 +6157,21 @@ class TypeDecl(BaseTypeDecl):
         Return a environment containing all primitives accessible to Self,
         with the adjusted `primitive_real_type` metadata field.
         """
-        return Entity.primitives_envs(
+        # Always fetch the environments of base types without Self's own
+        # environments, so that the (memoized) walk of base types is shared
+        # between the ``include_self`` variants (i.e. between
+        # ``primitives_env`` and ``parent_primitives_env``).
+        inherited_envs = Var(Entity.primitives_envs(
             with_rebindings=Entity.info.rebindings,
             stop_at=stop_at,
-            include_self=include_self
+            include_self=False
+        ))
+        return If(
+            include_self,
+            inherited_envs.concat(
+                Entity.own_primitives_envs(Entity.info.rebindings)
+            ),
+            inherited_envs
         ).env_group(
             with_md=T.Metadata.new(primitive_real_type=Self)
         )
@@ -6230,10 +6241,37 @@ class TypeDecl(BaseTypeDecl):
             all_prims.filter(lambda p: Not(p.is_a(SyntheticSubpDecl)))
         ))
 
+        # Predefined operators have no defining name, so they are not
+        # registered under a name in the primitives env.
+        predefined_ops = Var(If(
+            include_predefined_operators,
+            all_prims.filter(lambda p: p.is_a(SyntheticSubpDecl)),
+            No(BasicDecl.entity.array)
+        ))
+
         # Make sure to return only one instance of each primitive: the most
-        # "overriding" one.
+        # "overriding" one. Since two primitives can only override each other
+        # if they have the same name and the same number of parameters, only
+        # compare each primitive with the ones registered under its name in
+        # the primitives env (plus predefined operators) that have the same
+        # arity, instead of comparing it with all primitives, which would be
+        # quadratic in the number of primitives.
         return origin.bind(Self.origin_node, bds.filter(
-            lambda a: bds.all(lambda b: Let(
+            lambda a: Let(
+                lambda arity=a.subp_spec_or_null._.nb_max_params:
+                If(
+                    # Predefined operators have no name: fallback to the
+                    # exhaustive comparison for them.
+                    a.is_a(SyntheticSubpDecl),
+                    bds,
+                    prim_env.get(a.name_symbol).filtermap(
+                        lambda t: t.cast(BasicDecl),
+                        lambda t: Not(t.is_a(SyntheticSubpDecl))
+                    ).concat(predefined_ops)
+                ).filter(
+                    lambda b: b.subp_spec_or_null._.nb_max_params == arity
+                )
+            ).all(lambda b: Let(
                 lambda
                 a_prim=a.info.md.primitive.as_bare_entity.cast(BaseTypeDecl),
                 b_prim=b.info.md.primitive.as_bare_entity.cast(BaseTypeDecl):
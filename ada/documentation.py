@@ -99,4 +99,179 @@ libadalang_docs = {
 
             Find a way to report discarded source files/compilation units.
     """,
+    'libadalang.unit_export_tree': """
+        Export the whole tree of this unit in one call, as compact parallel
+        arrays: one element per node, nodes being sorted in prefix depth-first
+        order.
+
+        Each column (``kinds``, ``parents``, ``first_tokens``,
+        ``last_tokens``, ``start_lines``, ``start_columns``, ``end_lines`` and
+        ``end_columns``) is an array of C ints that supports the buffer
+        protocol, so that ``numpy.frombuffer`` can use it without copying.
+        ``parents`` contains the index of the parent node (-1 for the root
+        node), ``first_tokens`` and ``last_tokens`` contain the 0-based
+        indexes of the tokens that each node spans (``last_tokens`` is -1 for
+        ghost nodes) and ``kinds`` contain node kinds, which ``node_type``
+        turns into node classes.
+
+        Use ``node`` to get the node corresponding to an index in these
+        arrays. This raises a ``StaleReferenceError`` if the unit was reparsed
+        since the export.
+    """,
+    'libadalang.unit_export_tokens': """
+        Export the whole token stream of this unit (trivia included, if the
+        context keeps them) in one call, as compact parallel arrays: one
+        element per token, in source order.
+
+        Each column (``kinds``, ``is_trivia``, ``indexes``,
+        ``start_offsets``, ``end_offsets``, ``start_lines``,
+        ``start_columns``, ``end_lines`` and ``end_columns``) is an array of
+        C ints that supports the buffer protocol, so that ``numpy.frombuffer``
+        can use it without copying. ``indexes`` contain the same values as
+        ``Token.index`` and ``start_offsets``/``end_offsets`` delimit the text
+        of each token in ``source``.
+
+        Token texts are not materialized: ``text`` slices them on demand from
+        the unit source buffer, which is decoded only once.
+    """,
+    'libadalang.unit_apply_edit': """
+        Replace the text between the ``start`` and ``end`` 0-based character
+        offsets in the source buffer of this unit (the same buffer as
+        ``TokenExport.source``, i.e. including leading and trailing
+        whitespace) with ``text``, and reparse the unit from the resulting
+        buffer, using the charset that was used to decode the current one.
+        Return whether the unit was reparsed.
+
+        This is meant for editors, which usually know the range of text that
+        changed rather than the whole new buffer. Note that this is not an
+        incremental reparse: the whole unit is parsed again, exactly as with
+        ``AnalysisUnit.reparse``. Only edits that do not change the source
+        buffer (for instance when an editor reports a modification that was
+        undone) are cheaper: the unit is not reparsed, so its nodes stay valid
+        and name resolution results for it and for the units that depend on
+        it are kept.
+    """,
+    'libadalang.parse_cache': """
+        Opt-in on-disk cache for the columnar exports of analysis units (see
+        ``AnalysisUnit.export_tree`` and ``AnalysisUnit.export_tokens``),
+        stored in ``directory``.
+
+        Entries are keyed by a hash of the source buffer, of the charset used
+        to decode it, of whether trivia are kept and of the Libadalang library
+        in use, so that tools that only need syntactic information can skip
+        parsing for files that did not change since the previous run.
+
+        Exports loaded from the cache are not bound to analysis units: they
+        provide the same columns as fresh exports, but ``TreeExport.node`` is
+        not available for them.
+
+        Analysis contexts cannot load trees from the cache, so tools that need
+        nodes still have to parse source files. For tools that only do
+        syntactic checks on each file, ``run_tool`` caches their output
+        instead, so that they do not parse unchanged files at all. Its entries
+        are also keyed by the code of the tool, so that changing a checker
+        invalidates its outputs. The ``check_same_*`` and
+        ``check_bad_unequal`` contrib checkers use it with their
+        ``--parse-cache`` option.
+    """,
+    'libadalang.xref_cache': """
+        Opt-in on-disk cache for the results of name resolution in the units
+        of ``context``, stored in ``directory``.
+
+        The first request for a unit resolves all the names and expressions
+        in it and stores, for each of them, the referenced declaration and
+        the declaration of its type as stable keys (file name, source
+        location and node kind). Later requests, including from other
+        processes, load these keys instead of running name resolution, as
+        long as the unit and the source files it depends on (the units it
+        imports transitively and the units that contain referenced
+        declarations) did not change.
+
+        Changes in comments and in the layout of the units that are imported
+        but contain no referenced declaration do not invalidate cached
+        results: for these units, only the sequence of tokens matters. Tokens
+        in the private part of package specs are ignored too, unless the
+        cached unit can see it (i.e. unless it is the body of this package, a
+        subunit of it or one of its child units).
+
+        Declarations returned from cached keys are looked up in ``context``
+        and do not carry generic instantiation information.
+    """,
+    'libadalang.expr_eval_as_int_batch': """
+        Statically evaluate all the given expressions as integers in one call
+        and return the list of results, in the same order. Unlike
+        ``Expr.eval_as_int``, which raises a ``PropertyError``, this returns
+        ``None`` for expressions that cannot be evaluated.
+
+        Evaluations of number declarations and constants are cached in their
+        analysis unit until the next reparse in the analysis context, so that
+        evaluating many expressions that refer to the same constants (for
+        instance the bounds of all array types in a package) computes each
+        constant only once.
+    """,
+    'libadalang.node_query_batch': """
+        Run semantic queries on all the given nodes in one call and return a
+        ``NodeQueryResults`` instance, which contains one list of results per
+        query, in the order of ``nodes``:
+
+        * if ``referenced_decl`` is True, the declaration that each node
+          designates: the referenced declaration for names, the declaration
+          itself for defining names and declarations;
+        * if ``expression_type`` is True, the type of each expression;
+        * if ``fully_qualified_name`` is True, the fully qualified name of the
+          declaration that each node designates.
+
+        Results are None for nodes to which a query does not apply. Instead of
+        raising a ``PropertyError``, queries that fail for a node (including
+        names for which name resolution fails) store the error message in
+        ``errors``.
+
+        This is faster than calling ``p_referenced_decl``,
+        ``p_expression_type`` or ``p_fully_qualified_name`` on each node, as
+        there is only one call to the native library and no Python wrapper is
+        created for intermediate results. Name resolution itself is the same:
+        its results are memoized for each xref entry point in both cases.
+    """,
+    'libadalang.context_cache_statistics': """
+        Return usage statistics for the caches that Libadalang maintains on
+        top of memoized properties, in all the units of this context, as a
+        dict that maps cache names to ``CacheStatistics`` instances:
+
+        * ``name_resolution`` for the results of name resolution on xref entry
+          points;
+        * ``static_evaluation`` for the static evaluation of number
+          declarations and constants.
+
+        Lookup counts and compute times are accumulated since the creation of
+        each unit.
+    """,
+    'libadalang.context_set_cache_budget': """
+        Limit the total number of entries in the name resolution and static
+        evaluation caches (see ``cache_statistics``) of all the units in this
+        context to ``max_entries``. Zero, the default, means no limit.
+
+        When the limit is exceeded, the caches of the least recently used
+        units are cleared. This is always safe: cleared results are just
+        recomputed on the next query.
+
+        Note that this bounds only these two caches: memo tables of memoized
+        properties, lexical environments and analysis units themselves are not
+        affected, so this does not bound the memory usage of the context.
+    """,
+    'libadalang.context_profile_parse': """
+        Parse (or reparse) the given source file ``repeat`` times, keeping the
+        fastest time to reduce noise, and return a ``ParseProfile`` instance
+        describing its parsing costs: parsing time, size of the source,
+        number of tokens, nodes and diagnostics, and the nodes created by
+        error recovery, grouped by the grammar rules in which recovery
+        happened.
+
+        This helps finding pathological inputs, for instance sources whose
+        parsing time per character is much higher than the average because
+        of error recovery.
+
+        Note that this does not report invocation, memoization or backtracking
+        counts per grammar rule: collecting them would require instrumentation
+        in the parser that Langkit generates.
+    """,
 }
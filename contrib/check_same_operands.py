@@ -9,11 +9,14 @@ import argparse
 
 import libadalang as lal
 
+from checker_cache import add_parse_cache_option, run_checker
+
 
 parser = argparse.ArgumentParser(description=__doc__)
 parser.add_argument(
     'files', help='A file to analyze', type=str, nargs='+', metavar='file'
 )
+add_parse_cache_option(parser)
 
 
 def location(node):
@@ -73,8 +76,7 @@ def do_file(f):
 
 
 def main(args):
-    for f in args.files:
-        do_file(f)
+    run_checker(args, 'check_same_operands', do_file)
 
 
 if __name__ == '__main__':
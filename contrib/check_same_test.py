@@ -8,10 +8,13 @@ together in a chain of logical operators in the input Ada sources.
 import argparse
 import libadalang as lal
 
+from checker_cache import add_parse_cache_option, run_checker
+
 
 parser = argparse.ArgumentParser(description=__doc__)
 parser.add_argument('files', help='The files to analyze',
                     type=str, nargs='+', metavar='F')
+add_parse_cache_option(parser)
 
 
 def location(node):
@@ -78,8 +81,7 @@ def do_file(f):
 
 
 def main(args):
-    for f in args.files:
-        do_file(f)
+    run_checker(args, 'check_same_test', do_file)
 
 
 if __name__ == '__main__':
@@ -16,10 +16,13 @@ Hence no message is issued in the following cases:
 import argparse
 import libadalang as lal
 
+from checker_cache import add_parse_cache_option, run_checker
+
 
 parser = argparse.ArgumentParser(description=__doc__)
 parser.add_argument('files', help='The files to analyze',
                     type=str, nargs='+', metavar='F')
+add_parse_cache_option(parser)
 
 
 def same_tokens(left, right):
@@ -170,8 +173,7 @@ def do_file(f):
 
 
 def main(args):
-    for f in args.files:
-        do_file(f)
+    run_checker(args, 'check_same_then_else', do_file)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,34 @@
+"""
+Support for the ``--parse-cache`` option of the syntactic checkers in this
+directory (see ``libadalang.ParseCache.run_tool``).
+"""
+
+import libadalang as lal
+
+
+def add_parse_cache_option(parser):
+    """
+    Add the ``--parse-cache`` option to the ``parser`` argument parser.
+    """
+    parser.add_argument(
+        '--parse-cache', metavar='DIR',
+        help='Reuse the results of previous runs for files that did not'
+             ' change, using the cache in DIR (see libadalang.ParseCache)'
+    )
+
+
+def run_checker(args, tool, do_file):
+    """
+    Run the ``do_file`` checker on each file in ``args.files``. If the
+    ``--parse-cache`` option was passed, replay the output of previous runs
+    on unchanged files instead.
+
+    ``tool`` is the name of the checker, used to identify its entries in the
+    cache.
+    """
+    cache = lal.ParseCache(args.parse_cache) if args.parse_cache else None
+    for f in args.files:
+        if cache is None:
+            do_file(f)
+        else:
+            cache.run_tool(f, tool, do_file)
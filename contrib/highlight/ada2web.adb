@@ -1,27 +1,36 @@
 with Ada.Command_Line;
 with Ada.Containers.Generic_Array_Sort;
+with Ada.Containers.Indefinite_Ordered_Maps;
+with Ada.Containers.Indefinite_Ordered_Sets;
 with Ada.Containers.Ordered_Sets;
 with Ada.Containers.Vectors;
 with Ada.Directories;
+with Ada.Exceptions;
 with Ada.Text_IO;
+with System.Multiprocessors;
+
+with GNAT.SHA1;
+with GNAT.Strings;
 
 with GNATCOLL.Projects; use GNATCOLL.Projects;
 with GNATCOLL.Strings;  use GNATCOLL.Strings;
 with GNATCOLL.Traces;
 with GNATCOLL.VFS;      use GNATCOLL.VFS;
 with Libadalang.Analysis;
+with Libadalang.Common;
 with Libadalang.Project_Provider;
 
 with Colors;
 with Highlighter;
 with HTML;
 
---  Take an Ada source file as command-line argument and output a syntax
---  highlighted version of the source code on the standard output.
+--  Load a project tree and emit, for each source file in the given projects,
+--  an HTML document that contains its syntax highlighted and cross-referenced
+--  source code.
 --
---  By default, or if one argument is --html, output it as an HTML document
---  (CSS included). If --term256 appears instead, output it as a sequence of
---  ANSI escape codes.
+--  With --jobs/-j, process source files in parallel, using one analysis
+--  context per job. With --incremental, skip source files whose HTML document
+--  is up to date: see the Is_Up_To_Date function below.
 
 procedure Ada2Web is
 
@@ -43,14 +52,53 @@ procedure Ada2Web is
    --  pages: False means that there is an error. In this case, Parse_Arguments
    --  prints the error message.
 
-   procedure Process_File
-     (Project     : Project_Type;
-      Source_File : String;
-      Output_File : in out Ada.Text_IO.File_Type)
+   package String_Sets is new Ada.Containers.Indefinite_Ordered_Sets
+     (String);
+   package String_Maps is new Ada.Containers.Indefinite_Ordered_Maps
+     (String, String);
+
+   function Process_File
+     (Ctx          : LAL.Analysis_Context;
+      URLs         : String_Maps.Map;
+      Project_Name : String;
+      Source_File  : String;
+      Output_File  : in out Ada.Text_IO.File_Type;
+      Dependencies : in out String_Sets.Set;
+      Complete     : out Boolean) return Boolean
      with Pre => Writeable (Output_File);
    --  Emit highlighted and xref'd source code for the given Source_File, which
-   --  comes from Project. Write the syntax highlighted source code for Unit
-   --  according to Output_Format. The HTML code is written to Output_File.
+   --  comes from the Project_Name project, using the Ctx analysis context.
+   --  The HTML code is written to Output_File. URLs maps the source files of
+   --  all processed projects to the relative URLs of their HTML documents.
+   --
+   --  Add to Dependencies the names of the source files that the document
+   --  depends on: the source files that contain the targets of emitted links,
+   --  and the source files for all the units on which Source_File depends,
+   --  directly or not, as they affect name resolution. Set Complete to whether
+   --  these units could be computed. Return whether the document could be
+   --  emitted (i.e. whether Source_File has no parsing error).
+
+   function File_Hash (Filename : String) return String;
+   --  Return a hash of the content of Filename (an empty string if it cannot
+   --  be read).
+
+   function Is_Up_To_Date (Output_Filename, Key : String) return Boolean;
+   --  Return whether the HTML document in Output_Filename can be kept as-is.
+   --  This is the case if it was generated with the same Key (i.e. for the
+   --  same set of projects, source files and URLs) and if neither its source
+   --  file nor the source files it depends on (see Process_File) have changed
+   --  since then. Return False if the stamp file cannot be read.
+
+   procedure Write_Stamp
+     (Output_Filename, Key, Source_File : String;
+      Dependencies                      : String_Sets.Set);
+   --  Write the data that Is_Up_To_Date uses to check the HTML document in
+   --  Output_Filename.
+
+   function Stamp_Filename (Output_Filename : String) return String is
+     (Output_Filename & ".stamp");
+   --  Name of the file in which Write_Stamp stores data for the
+   --  Output_Filename HTML document.
 
    procedure Emit_HTML_Header
      (File          : in out Ada.Text_IO.File_Type;
@@ -77,9 +125,14 @@ procedure Ada2Web is
    Projects : Project_Sets.Set;
    --  Subset of projects in Prj_Tree for which we emit highlighted source code
 
-   Ctx : LAL.Analysis_Context;
    UFP : LAL.Unit_Provider_Reference;
 
+   Jobs : Natural := 1;
+   --  Number of parallel jobs to use. If zero, use one job per CPU.
+
+   Incremental : Boolean := False;
+   --  Whether to skip the generation of up-to-date HTML documents
+
    CSS_Filename : constant String := "style.css";
 
    ---------------------
@@ -90,6 +143,25 @@ procedure Ada2Web is
       Project_File  : XString;
       Scenario_Vars : String_Vectors.Vector;
       Project_List  : String_Vectors.Vector;
+
+      function Parse_Jobs (Value : XString) return Boolean;
+      --  Set Jobs to the natural number in Value and return True. If Value is
+      --  not a valid number of jobs, print an error and return False.
+
+      ----------------
+      -- Parse_Jobs --
+      ----------------
+
+      function Parse_Jobs (Value : XString) return Boolean is
+      begin
+         Jobs := Natural'Value (Value.To_String);
+         return True;
+      exception
+         when Constraint_Error =>
+            Print_Usage ("Invalid number of jobs: " & Value.To_String);
+            return False;
+      end Parse_Jobs;
+
    begin
       for I in 1 .. Ada.Command_Line.Argument_Count loop
          declare
@@ -103,6 +175,12 @@ procedure Ada2Web is
                   if Opt = "help" then
                      Print_Usage;
                      return False;
+                  elsif Opt = "incremental" then
+                     Incremental := True;
+                  elsif Opt.Starts_With ("jobs=") then
+                     if not Parse_Jobs (Opt.Slice (6, Opt.Length)) then
+                        return False;
+                     end if;
                   else
                      Print_Usage ("Invalid option: " & Arg.To_String);
                      return False;
@@ -118,6 +196,10 @@ procedure Ada2Web is
                      Project_File := Opt.Slice (2, Opt.Length);
                   elsif Opt.Starts_With ("X") then
                      Scenario_Vars.Append (Opt.Slice (2, Opt.Length));
+                  elsif Opt.Starts_With ("j") then
+                     if not Parse_Jobs (Opt.Slice (2, Opt.Length)) then
+                        return False;
+                     end if;
                   else
                      Print_Usage ("Invalid option: " & Arg.To_String);
                      return False;
@@ -197,6 +279,8 @@ procedure Ada2Web is
         ("Usage: " & Command
          & " -P[project-file]"
          & " -X[scenario-variable]=[value]"
+         & " [--jobs=N|-jN]"
+         & " [--incremental]"
          & " [project-names]");
    end Print_Usage;
 
@@ -204,14 +288,22 @@ procedure Ada2Web is
    -- Process_File --
    ------------------
 
-   procedure Process_File
-     (Project     : Project_Type;
-      Source_File : String;
-      Output_File : in out Ada.Text_IO.File_Type)
+   function Process_File
+     (Ctx          : LAL.Analysis_Context;
+      URLs         : String_Maps.Map;
+      Project_Name : String;
+      Source_File  : String;
+      Output_File  : in out Ada.Text_IO.File_Type;
+      Dependencies : in out String_Sets.Set;
+      Complete     : out Boolean) return Boolean
    is
       procedure Put (S : String);
       --  Write the given string to Output_File
 
+      procedure Add_Dependencies (CU : LAL.Compilation_Unit);
+      --  Add to Dependencies the source files for all the units on which CU
+      --  depends. Reset Complete if they cannot be computed.
+
       function URL (U : LAL.Analysis_Unit) return String;
       --  If U belongs to the set of projects under consideration, return the
       --  relative URL to the highlighted source code for U. Otherwise, return
@@ -238,27 +330,46 @@ procedure Ada2Web is
 
       function URL (U : LAL.Analysis_Unit) return String is
          Filename : constant String := LAL.Get_Filename (U);
-         Info     : constant File_Info := Prj_Tree.Info (Create (+Filename));
-
+         Position : constant String_Maps.Cursor := URLs.Find (Filename);
       begin
-         if Info.Project = No_Project
-           or else not Projects.Contains (Info.Project)
-         then
+         if not String_Maps.Has_Element (Position) then
             return "";
          end if;
 
-         declare
-            Prj_Dir : constant String := Ada.Directories.Compose
-              ("..", Info.Project.Name);
-         begin
-            return Ada.Directories.Compose
-              (Prj_Dir, +Create (+Filename).Base_Name & ".html");
-         end;
+         Dependencies.Include (Filename);
+         return String_Maps.Element (Position);
       end URL;
 
+      ----------------------
+      -- Add_Dependencies --
+      ----------------------
+
+      procedure Add_Dependencies (CU : LAL.Compilation_Unit) is
+      begin
+         for D of CU.P_Unit_Dependencies loop
+            declare
+               Filename : constant String := LAL.Get_Filename (D.Unit);
+            begin
+               --  Skip units that do not come from a source file, such as
+               --  the predefined Standard package.
+
+               if Create (+Filename).Is_Regular_File then
+                  Dependencies.Include (Filename);
+               end if;
+            end;
+         end loop;
+      exception
+         when Libadalang.Common.Property_Error =>
+            Complete := False;
+      end Add_Dependencies;
+
       procedure Put_Tokens_HTML is new HTML.Put_Tokens (Put, URL);
 
+      Root : constant LAL.Ada_Node := LAL.Root (Unit);
+
    begin
+      Complete := True;
+
       --  If there are any error, just print them on the standard error
       --  stream and abort. Otherwise, do our job.
       if LAL.Has_Diagnostics (Unit) then
@@ -267,8 +378,7 @@ procedure Ada2Web is
               (Ada.Text_IO.Standard_Error,
                LAL.Format_GNU_Diagnostic (Unit, D));
          end loop;
-         Ada.Command_Line.Set_Exit_Status (Ada.Command_Line.Failure);
-         return;
+         return False;
       end if;
 
       --  Otherwise, create highlighting annotations and emit the HTML document
@@ -276,15 +386,122 @@ procedure Ada2Web is
       Highlighter.Highlight (Unit, Highlights);
 
       Emit_HTML_Header
-        (Output_File, Project.Name & " - " & HTML.Escape (Source_File), "../");
+        (Output_File, Project_Name & " - " & HTML.Escape (Source_File), "../");
 
       Put ("<div><a href=""../index.html"">Go back to the index</a></div>");
       Put_Tokens_HTML (Unit, Highlights, "utf-8", With_Xrefs => True);
       Put ("<div><a href=""../index.html"">Go back to the index</a></div>");
 
       Emit_HTML_Footer (Output_File);
+
+      --  Links cover only the sources of the processed projects, but edits
+      --  in any unit that Source_File depends on, including units outside
+      --  these projects, can change the result of name resolution.
+
+      case Root.Kind is
+         when Libadalang.Common.Ada_Compilation_Unit =>
+            Add_Dependencies (Root.As_Compilation_Unit);
+         when Libadalang.Common.Ada_Compilation_Unit_List =>
+            for I in 1 .. Root.Children_Count loop
+               Add_Dependencies (Root.Child (I).As_Compilation_Unit);
+            end loop;
+         when others =>
+            null;
+      end case;
+      return True;
    end Process_File;
 
+   ---------------
+   -- File_Hash --
+   ---------------
+
+   function File_Hash (Filename : String) return String is
+      Content : GNAT.Strings.String_Access := Create (+Filename).Read_File;
+   begin
+      if Content = null then
+         return "";
+      end if;
+
+      return Result : constant String := GNAT.SHA1.Digest (Content.all) do
+         GNAT.Strings.Free (Content);
+      end return;
+   end File_Hash;
+
+   -------------------
+   -- Is_Up_To_Date --
+   -------------------
+
+   function Is_Up_To_Date (Output_Filename, Key : String) return Boolean is
+      use Ada.Text_IO;
+
+      Stamp  : File_Type;
+      Result : Boolean := True;
+   begin
+      if not Ada.Directories.Exists (Output_Filename)
+        or else not Ada.Directories.Exists (Stamp_Filename (Output_Filename))
+      then
+         return False;
+      end if;
+
+      --  The first line contains the key, and each of the other lines
+      --  contains the hash of a source file followed by its name.
+
+      Open (Stamp, In_File, Stamp_Filename (Output_Filename));
+      if End_Of_File (Stamp) or else Get_Line (Stamp) /= Key then
+         Result := False;
+      end if;
+
+      while Result and then not End_Of_File (Stamp) loop
+         declare
+            Line      : constant String := Get_Line (Stamp);
+            Hash_Last : constant Natural :=
+              Line'First + GNAT.SHA1.Message_Digest'Length - 1;
+         begin
+            Result :=
+              Line'Length > GNAT.SHA1.Message_Digest'Length + 1
+              and then Line (Hash_Last + 1) = ' '
+              and then File_Hash (Line (Hash_Last + 2 .. Line'Last))
+                       = Line (Line'First .. Hash_Last);
+         end;
+      end loop;
+
+      Close (Stamp);
+      return Result;
+
+   exception
+      --  A malformed or unreadable stamp just means that the document must
+      --  be generated again.
+
+      when others =>
+         if Is_Open (Stamp) then
+            Close (Stamp);
+         end if;
+         return False;
+   end Is_Up_To_Date;
+
+   -----------------
+   -- Write_Stamp --
+   -----------------
+
+   procedure Write_Stamp
+     (Output_Filename, Key, Source_File : String;
+      Dependencies                      : String_Sets.Set)
+   is
+      use Ada.Text_IO;
+
+      Stamp : File_Type;
+   begin
+      Create (Stamp, Out_File, Stamp_Filename (Output_Filename));
+      Put_Line (Stamp, Key);
+      Put_Line (Stamp, File_Hash (Source_File) & " " & Source_File);
+      for F of Dependencies loop
+         if F /= Source_File then
+            Put_Line (Stamp, File_Hash (F) & " " & F);
+         end if;
+      end loop;
+      Close (Stamp);
+   end Write_Stamp;
+
    ----------------------
    -- Create_If_Needed --
    ----------------------
@@ -326,6 +543,164 @@ procedure Ada2Web is
       Ada.Text_IO.Put_Line (File, "</body></html>");
    end Emit_HTML_Footer;
 
+   type Work_Item is record
+      Project_Name    : XString;
+      Source_File     : XString;
+      Output_Filename : XString;
+   end record;
+   --  HTML document to generate for one Ada source file
+
+   package Work_Item_Vectors is new Ada.Containers.Vectors
+     (Positive, Work_Item);
+
+   Work_Items : Work_Item_Vectors.Vector;
+   --  All the HTML documents to generate
+
+   URLs : String_Maps.Map;
+   --  Relative URLs for the HTML documents of all source files in Projects
+
+   Key : XString;
+   --  Key for the generation of HTML documents: see Is_Up_To_Date
+
+   protected Work_Queue is
+      procedure Next (Item : out Work_Item; Found : out Boolean);
+      --  If there are items left to process in Work_Items, set Item to the
+      --  next one and Found to True. Set Found to False otherwise.
+
+      procedure Set_Failure;
+      --  Record that the generation of a document failed
+
+      function Failed return Boolean;
+      --  Return whether the generation of at least one document failed
+   private
+      Next_Index : Positive := 1;
+      Failure    : Boolean := False;
+   end Work_Queue;
+
+   task type Worker
+      --  Increase the task's Storage_Size to match the primary stack size, to
+      --  avoid stack overflows during name resolution.
+      with Storage_Size => 8 * 1024 * 1024
+   is
+      entry Start (URLs : String_Maps.Map; Key : String);
+   end Worker;
+   --  Job to generate HTML documents for the items in Work_Items, with its
+   --  own analysis context.
+
+   ----------------
+   -- Work_Queue --
+   ----------------
+
+   protected body Work_Queue is
+
+      ----------
+      -- Next --
+      ----------
+
+      procedure Next (Item : out Work_Item; Found : out Boolean) is
+      begin
+         Found := Next_Index <= Natural (Work_Items.Length);
+         if Found then
+            Item := Work_Items (Next_Index);
+            Next_Index := Next_Index + 1;
+         end if;
+      end Next;
+
+      -----------------
+      -- Set_Failure --
+      -----------------
+
+      procedure Set_Failure is
+      begin
+         Failure := True;
+      end Set_Failure;
+
+      ------------
+      -- Failed --
+      ------------
+
+      function Failed return Boolean is
+      begin
+         return Failure;
+      end Failed;
+
+   end Work_Queue;
+
+   ------------
+   -- Worker --
+   ------------
+
+   task body Worker is
+      Ctx        : LAL.Analysis_Context;
+      Local_URLs : String_Maps.Map;
+      Local_Key  : XString;
+      Item       : Work_Item;
+      Found      : Boolean;
+   begin
+      --  Work on copies of URLs and Key, as containers are not safe for
+      --  concurrent reads.
+
+      accept Start (URLs : String_Maps.Map; Key : String) do
+         Local_URLs := URLs.Copy;
+         Local_Key := To_XString (Key);
+      end Start;
+
+      Ctx := LAL.Create_Context (Unit_Provider => UFP);
+
+      loop
+         Work_Queue.Next (Item, Found);
+         exit when not Found;
+
+         declare
+            Source_File     : constant String := Item.Source_File.To_String;
+            Output_Filename : constant String :=
+              Item.Output_Filename.To_String;
+            Output_File     : Ada.Text_IO.File_Type;
+            Dependencies    : String_Sets.Set;
+            Complete        : Boolean;
+         begin
+            if not Incremental
+              or else not Is_Up_To_Date (Output_Filename, Local_Key.To_String)
+            then
+               Ada.Text_IO.Create
+                 (Output_File, Ada.Text_IO.Out_File, Output_Filename);
+               if Process_File
+                 (Ctx, Local_URLs, Item.Project_Name.To_String, Source_File,
+                  Output_File, Dependencies, Complete)
+               then
+                  Ada.Text_IO.Close (Output_File);
+
+                  --  If the dependencies of Source_File are not known, remove
+                  --  any stamp from a previous run so that the next run
+                  --  generates this document again.
+
+                  if Incremental and then Complete then
+                     Write_Stamp
+                       (Output_Filename, Local_Key.To_String, Source_File,
+                        Dependencies);
+                  elsif Incremental
+                    and then Ada.Directories.Exists
+                               (Stamp_Filename (Output_Filename))
+                  then
+                     Ada.Directories.Delete_File
+                       (Stamp_Filename (Output_Filename));
+                  end if;
+               else
+                  Ada.Text_IO.Close (Output_File);
+                  Work_Queue.Set_Failure;
+               end if;
+            end if;
+         end;
+      end loop;
+
+   exception
+      when E : others =>
+         Ada.Text_IO.Put_Line
+           (Ada.Text_IO.Standard_Error,
+            "Unexpected error: " & Ada.Exceptions.Exception_Information (E));
+         Work_Queue.Set_Failure;
+   end Worker;
+
    Output_Dir : XString;
    Index      : Ada.Text_IO.File_Type;
 
@@ -337,10 +712,9 @@ begin
       return;
    end if;
 
-   --  Create the analysis context for Libadalang
+   --  Create the unit provider for the analysis contexts of all jobs
    UFP := Libadalang.Project_Provider.Create_Project_Unit_Provider
      (Prj_Tree, Prj_Tree.Root_Project, Env);
-   Ctx := LAL.Create_Context (Unit_Provider => UFP);
 
    --  Create the output directories, if needed
    declare
@@ -406,8 +780,9 @@ begin
       Ada.Directories.Compose (Output_Dir.To_String, "index.html"));
    Emit_HTML_Header (Index, Prj_Tree.Root_Project.Name, "");
 
-   --  Go through each source file in each analyzed project to generate one
-   --  HTML document of highlighted source code per source file.
+   --  Go through each source file in each analyzed project to plan the
+   --  generation of one HTML document of highlighted source code per source
+   --  file, and to compute the URLs of these documents.
    for P of Projects loop
       declare
          Sub_Dir   : constant String :=
@@ -435,19 +810,31 @@ begin
                HTML_Filename   : constant String := Src_Filename & ".html";
                Output_Filename : constant String :=
                  Ada.Directories.Compose (Sub_Dir, HTML_Filename);
-               Output_File     : Ada.Text_IO.File_Type;
+               Full_Filename   : constant String := +Full_Name (Info.File);
             begin
                Ada.Text_IO.Put_Line (Index, "<li><a href=""" & Output_Filename
                                      & """>" & Src_Filename & "</a>");
 
-               Ada.Text_IO.Create
-                 (Output_File, Ada.Text_IO.Out_File, Output_Filename);
+               URLs.Include
+                 (Full_Filename,
+                  Ada.Directories.Compose
+                    (Ada.Directories.Compose ("..", P.Name), HTML_Filename));
 
                if To_XString (Info.Language).To_Lower = "ada" then
-                  Process_File (P, +Full_Name (Info.File), Output_File);
+                  Work_Items.Append
+                    ((Project_Name    => To_XString (P.Name),
+                      Source_File     => To_XString (Full_Filename),
+                      Output_Filename => To_XString (Output_Filename)));
+               else
+                  --  Non-Ada sources get an empty document
+                  declare
+                     Output_File : Ada.Text_IO.File_Type;
+                  begin
+                     Ada.Text_IO.Create
+                       (Output_File, Ada.Text_IO.Out_File, Output_Filename);
+                     Ada.Text_IO.Close (Output_File);
+                  end;
                end if;
-
-               Ada.Text_IO.Close (Output_File);
             end;
          end loop;
          Unchecked_Free (Src_Files);
@@ -455,6 +842,43 @@ begin
       end;
    end loop;
 
+   --  HTML documents depend on the set of projects for which we generate
+   --  documents, as only sources from these projects get links, and on the
+   --  list of their source files and URLs, as adding, removing or moving a
+   --  source file changes the possible targets of links.
+   declare
+      Sources_Hash : GNAT.SHA1.Context;
+   begin
+      Key := To_XString ("ada2web-3");
+      for P of Projects loop
+         Key.Append (" " & P.Name);
+      end loop;
+
+      for Cur in URLs.Iterate loop
+         GNAT.SHA1.Update
+           (Sources_Hash,
+            String_Maps.Key (Cur) & ASCII.LF
+            & String_Maps.Element (Cur) & ASCII.LF);
+      end loop;
+      Key.Append (" " & GNAT.SHA1.Digest (Sources_Hash));
+   end;
+
+   --  Now generate all HTML documents, starting one worker per job
+   declare
+      Workers : array (1 .. (if Jobs = 0
+                             then Positive
+                                    (System.Multiprocessors.Number_Of_CPUs)
+                             else Jobs)) of Worker;
+   begin
+      for W of Workers loop
+         W.Start (URLs, Key.To_String);
+      end loop;
+   end;
+
+   if Work_Queue.Failed then
+      Ada.Command_Line.Set_Exit_Status (Ada.Command_Line.Failure);
+   end if;
+
    Emit_HTML_Footer (Index);
    Ada.Text_IO.Close (Index);
 end Ada2Web;
@@ -0,0 +1,437 @@
+--  Long-running analysis server: load a project once, keep its analysis
+--  context warm and answer JSON requests read on the standard input, one per
+--  line. See README.md for the protocol.
+
+with Ada.Characters.Handling; use Ada.Characters.Handling;
+with Ada.Containers.Indefinite_Ordered_Sets;
+with Ada.Exceptions;          use Ada.Exceptions;
+with Ada.Text_IO;             use Ada.Text_IO;
+
+with GNATCOLL.JSON;     use GNATCOLL.JSON;
+with GNATCOLL.Opt_Parse;
+
+with Langkit_Support.Slocs; use Langkit_Support.Slocs;
+with Langkit_Support.Text;  use Langkit_Support.Text;
+with Libadalang.Analysis;   use Libadalang.Analysis;
+with Libadalang.Common;     use Libadalang.Common;
+with Libadalang.Helpers;    use Libadalang.Helpers;
+
+procedure LAL_Server is
+
+   procedure Process_Unit (Context : App_Job_Context; Unit : Analysis_Unit);
+   --  Populate lexical environments for Unit, so that the first requests do
+   --  not have to.
+
+   procedure App_Post_Process
+     (Context : App_Context; Jobs : App_Job_Context_Array);
+   --  Serve requests until the end of the standard input or until a
+   --  "shutdown" request.
+
+   --  Requests are served using the analysis context of a single job, so
+   --  there is no point in processing units in parallel at startup: keep
+   --  parallelism disabled (no --jobs option), so that Process_Unit runs in
+   --  the same task and analysis context as requests.
+
+   package App is new Libadalang.Helpers.App
+     (Name               => "lal_server",
+      Description        =>
+         "Analysis server: answer JSON requests on the standard input, using"
+         & " the same analysis context for all requests",
+      Enable_Parallelism => False,
+      Process_Unit       => Process_Unit,
+      App_Post_Process   => App_Post_Process);
+
+   package Args is
+      use GNATCOLL.Opt_Parse;
+
+      package Max_Completions is new Parse_Option
+        (App.Args.Parser, Long => "--max-completions",
+         Help        => "Maximum number of items to return for completion"
+                        & " requests",
+         Arg_Type    => Positive,
+         Default_Val => 100);
+   end Args;
+
+   Request_Error : exception;
+   --  Raised when a request is invalid. Its message is sent back to the
+   --  client.
+
+   package String_Sets is new Ada.Containers.Indefinite_Ordered_Sets
+     (String);
+
+   Filenames : String_Sets.Set;
+   --  Names of the source files for the units that were processed at startup
+   --  or designated by requests: search references in them. Store names
+   --  rather than units so that units are always fetched from the analysis
+   --  context that serves requests.
+
+   function Location (Node : Ada_Node'Class) return JSON_Value;
+   --  Return a JSON object that describes the source location of Node
+
+   function Decl_Info (Decl : Basic_Decl'Class) return JSON_Value;
+   --  Return a JSON object that describes Decl: its location, kind and name,
+   --  or the JSON null value if Decl is null.
+
+   function Get_Unit
+     (Context : Analysis_Context; Params : JSON_Value) return Analysis_Unit;
+   --  Return the unit for the "file" request parameter
+
+   function Node_At
+     (Context : Analysis_Context; Params : JSON_Value) return Ada_Node;
+   --  Return the innermost node at the location that the "file", "line" and
+   --  "column" request parameters designate.
+
+   function Enclosing_Name (Node : Ada_Node) return Name;
+   --  Return the innermost name that contains Node, or No_Name if there is
+   --  none.
+
+   function Handle_Request
+     (Context : Analysis_Context;
+      Method  : String;
+      Params  : JSON_Value) return JSON_Value;
+   --  Run the given request and return its result
+
+   ------------------
+   -- Process_Unit --
+   ------------------
+
+   procedure Process_Unit (Context : App_Job_Context; Unit : Analysis_Unit) is
+      pragma Unreferenced (Context);
+   begin
+      Unit.Populate_Lexical_Env;
+      Filenames.Include (Unit.Get_Filename);
+   end Process_Unit;
+
+   --------------
+   -- Location --
+   --------------
+
+   function Location (Node : Ada_Node'Class) return JSON_Value is
+      Result : constant JSON_Value := Create_Object;
+      Sloc   : constant Source_Location_Range := Node.Sloc_Range;
+   begin
+      Result.Set_Field ("file", Node.Unit.Get_Filename);
+      Result.Set_Field ("line", Integer (Sloc.Start_Line));
+      Result.Set_Field ("column", Integer (Sloc.Start_Column));
+      Result.Set_Field ("end_line", Integer (Sloc.End_Line));
+      Result.Set_Field ("end_column", Integer (Sloc.End_Column));
+      return Result;
+   end Location;
+
+   ---------------
+   -- Decl_Info --
+   ---------------
+
+   function Decl_Info (Decl : Basic_Decl'Class) return JSON_Value is
+   begin
+      if Decl.Is_Null then
+         return JSON_Null;
+      end if;
+
+      declare
+         Result : constant JSON_Value := Location (Decl);
+         DN     : constant Defining_Name := Decl.P_Defining_Name;
+      begin
+         Result.Set_Field ("kind", Decl.Kind_Name);
+         if not DN.Is_Null then
+            Result.Set_Field ("name", To_UTF8 (DN.Text));
+         end if;
+         return Result;
+      end;
+   end Decl_Info;
+
+   --------------
+   -- Get_Unit --
+   --------------
+
+   function Get_Unit
+     (Context : Analysis_Context; Params : JSON_Value) return Analysis_Unit
+   is
+   begin
+      if not Params.Has_Field ("file") then
+         raise Request_Error with "missing ""file"" parameter";
+      end if;
+
+      declare
+         Filename : constant String := Params.Get ("file");
+         Result   : constant Analysis_Unit :=
+            Context.Get_From_File (Filename);
+      begin
+         Filenames.Include (Result.Get_Filename);
+         return Result;
+      end;
+   end Get_Unit;
+
+   -------------
+   -- Node_At --
+   -------------
+
+   function Node_At
+     (Context : Analysis_Context; Params : JSON_Value) return Ada_Node
+   is
+      Unit : constant Analysis_Unit := Get_Unit (Context, Params);
+   begin
+      if not Params.Has_Field ("line") or else not Params.Has_Field ("column")
+      then
+         raise Request_Error with "missing ""line"" or ""column"" parameter";
+      elsif Unit.Root.Is_Null then
+         raise Request_Error with "cannot parse " & Unit.Get_Filename;
+      end if;
+
+      declare
+         Line   : constant Integer := Params.Get ("line");
+         Column : constant Integer := Params.Get ("column");
+         Result : Ada_Node;
+      begin
+         if Line < 1 or else Column < 1 then
+            raise Request_Error with "invalid source location";
+         end if;
+
+         Result := Unit.Root.Lookup
+           ((Line_Number (Line), Column_Number (Column)));
+         if Result.Is_Null then
+            raise Request_Error with "no node at this source location";
+         end if;
+         return Result;
+      end;
+   end Node_At;
+
+   --------------------
+   -- Enclosing_Name --
+   --------------------
+
+   function Enclosing_Name (Node : Ada_Node) return Name is
+      N : Ada_Node := Node;
+   begin
+      while not N.Is_Null and then N.Kind not in Ada_Name loop
+         N := N.Parent;
+      end loop;
+      return (if N.Is_Null then No_Name else N.As_Name);
+   end Enclosing_Name;
+
+   --------------------
+   -- Handle_Request --
+   --------------------
+
+   function Handle_Request
+     (Context : Analysis_Context;
+      Method  : String;
+      Params  : JSON_Value) return JSON_Value
+   is
+      Result : JSON_Array;
+   begin
+      if Method = "referenced_decl" then
+         declare
+            N : constant Name := Enclosing_Name (Node_At (Context, Params));
+         begin
+            if N.Is_Null then
+               return JSON_Null;
+            elsif N.P_Is_Defining then
+               return Decl_Info (N.P_Enclosing_Defining_Name.P_Basic_Decl);
+            else
+               return Decl_Info (N.P_Referenced_Decl);
+            end if;
+         end;
+
+      elsif Method = "references" then
+         declare
+            N  : constant Name := Enclosing_Name (Node_At (Context, Params));
+            DN : Defining_Name;
+         begin
+            if N.Is_Null then
+               return Create (Result);
+            elsif N.P_Is_Defining then
+               DN := N.P_Enclosing_Defining_Name;
+            else
+               DN := N.P_Referenced_Defining_Name;
+            end if;
+            if DN.Is_Null then
+               return Create (Result);
+            end if;
+
+            declare
+               Search_Units : Analysis_Unit_Array
+                 (1 .. Natural (Filenames.Length));
+               I            : Positive := Search_Units'First;
+            begin
+               for F of Filenames loop
+                  Search_Units (I) := Context.Get_From_File (F);
+                  I := I + 1;
+               end loop;
+
+               for R of DN.P_Find_All_References (Search_Units) loop
+                  declare
+                     Item : constant JSON_Value := Location (Ref (R));
+                  begin
+                     Item.Set_Field ("kind", To_Lower (Kind (R)'Image));
+                     Append (Result, Item);
+                  end;
+               end loop;
+            end;
+            return Create (Result);
+         end;
+
+      elsif Method = "complete" then
+         declare
+            Iter  : Completion_Item_Iterator :=
+               Node_At (Context, Params).P_Complete;
+            Item  : Completion_Item;
+            Count : Natural := 0;
+         begin
+            while Count < Args.Max_Completions.Get
+                  and then Next (Iter, Item)
+            loop
+               if not Decl (Item).Is_Null then
+                  declare
+                     Info : constant JSON_Value := Decl_Info (Decl (Item));
+                  begin
+                     Info.Set_Field ("is_dot_call", Is_Dot_Call (Item));
+                     Info.Set_Field ("is_visible", Is_Visible (Item));
+                     Append (Result, Info);
+                     Count := Count + 1;
+                  end;
+               end if;
+            end loop;
+            return Create (Result);
+         end;
+
+      elsif Method = "primitives" then
+         declare
+            Node : Ada_Node := Node_At (Context, Params);
+            N    : constant Name := Enclosing_Name (Node);
+         begin
+            --  Accept both names that designate types and locations in type
+            --  declarations.
+
+            if not N.Is_Null and then not N.P_Is_Defining then
+               Node := N.P_Referenced_Decl.As_Ada_Node;
+            end if;
+            while not Node.Is_Null
+                  and then Node.Kind not in Ada_Base_Type_Decl
+            loop
+               Node := Node.Parent;
+            end loop;
+            if Node.Is_Null then
+               raise Request_Error with "no type at this source location";
+            end if;
+
+            for Prim of Node.As_Base_Type_Decl.P_Get_Primitives loop
+               Append (Result, Decl_Info (Prim));
+            end loop;
+            return Create (Result);
+         end;
+
+      elsif Method = "diagnostics" then
+         declare
+            Unit : constant Analysis_Unit := Get_Unit (Context, Params);
+         begin
+            for D of Unit.Diagnostics loop
+               declare
+                  Item : constant JSON_Value := Create_Object;
+               begin
+                  Item.Set_Field ("line", Integer (D.Sloc_Range.Start_Line));
+                  Item.Set_Field
+                    ("column", Integer (D.Sloc_Range.Start_Column));
+                  Item.Set_Field
+                    ("end_line", Integer (D.Sloc_Range.End_Line));
+                  Item.Set_Field
+                    ("end_column", Integer (D.Sloc_Range.End_Column));
+                  Item.Set_Field ("message", To_UTF8 (To_Text (D.Message)));
+                  Append (Result, Item);
+               end;
+            end loop;
+            return Create (Result);
+         end;
+
+      elsif Method = "did_change" then
+         declare
+            Unit : constant Analysis_Unit := Get_Unit (Context, Params);
+         begin
+            --  Reparse the unit from the buffer that the client sent, if
+            --  any, or from its source file otherwise.
+
+            if Params.Has_Field ("text") then
+               Unit.Reparse
+                 (Charset => "utf-8", Buffer => Params.Get ("text"));
+            else
+               Unit.Reparse;
+            end if;
+            return JSON_Null;
+         end;
+
+      else
+         raise Request_Error with "unknown method: " & Method;
+      end if;
+   end Handle_Request;
+
+   ----------------------
+   -- App_Post_Process --
+   ----------------------
+
+   procedure App_Post_Process
+     (Context : App_Context; Jobs : App_Job_Context_Array)
+   is
+      pragma Unreferenced (Context);
+
+      Ctx : constant Analysis_Context := Jobs (Jobs'First).Analysis_Ctx;
+   begin
+      while not End_Of_File loop
+         declare
+            Line     : constant String := Get_Line;
+            Request  : JSON_Value;
+            Response : constant JSON_Value := Create_Object;
+            Shutdown : Boolean := False;
+         begin
+            begin
+               Request := Read (Line);
+               if Request.Kind /= JSON_Object_Type
+                 or else not Request.Has_Field ("method")
+               then
+                  raise Request_Error with "invalid request";
+               end if;
+               if Request.Has_Field ("id") then
+                  Response.Set_Field ("id", JSON_Value'(Request.Get ("id")));
+               end if;
+
+               declare
+                  Method : constant String := Request.Get ("method");
+                  Params : constant JSON_Value :=
+                    (if Request.Has_Field ("params")
+                     then Request.Get ("params")
+                     else Create_Object);
+               begin
+                  if Method = "shutdown" then
+                     Shutdown := True;
+                     Response.Set_Field ("result", JSON_Null);
+                  else
+                     Response.Set_Field
+                       ("result", Handle_Request (Ctx, Method, Params));
+                  end if;
+               end;
+
+            exception
+               when E : Request_Error =>
+                  Response.Set_Field ("error", Exception_Message (E));
+               when E : Invalid_JSON_Stream =>
+                  Response.Set_Field
+                    ("error", "invalid JSON: " & Exception_Message (E));
+
+               --  Do not let a failing request (for instance a bug in name
+               --  resolution) stop the server.
+
+               when E : others =>
+                  Response.Set_Field
+                    ("error",
+                     Exception_Name (E) & ": " & Exception_Message (E));
+            end;
+
+            Put_Line (Response.Write);
+            Flush;
+            exit when Shutdown;
+         end;
+      end loop;
+   end App_Post_Process;
+
+begin
+   App.Run;
+end LAL_Server;
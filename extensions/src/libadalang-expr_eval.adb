@@ -21,15 +21,21 @@
 -- <http://www.gnu.org/licenses/>.                                          --
 ------------------------------------------------------------------------------
 
+with Ada.Calendar; use Ada.Calendar;
 with Ada.Exceptions;
 with Ada.Strings.Wide_Wide_Unbounded; use Ada.Strings.Wide_Wide_Unbounded;
 
-with Libadalang.Analysis; use Libadalang.Analysis;
-with Libadalang.Common;   use Libadalang.Common;
-with Libadalang.Sources;  use Libadalang.Sources;
+with Libadalang.Analysis;          use Libadalang.Analysis;
+with Libadalang.Common;            use Libadalang.Common;
+with Libadalang.Implementation;
+with Libadalang.Implementation.Extensions;
+with Libadalang.Public_Converters; use Libadalang.Public_Converters;
+with Libadalang.Sources;           use Libadalang.Sources;
 
 package body Libadalang.Expr_Eval is
 
+   package Impl renames Libadalang.Implementation;
+
    use type GNATCOLL.GMP.Integers.Big_Integer;
 
    function "+" (S : Wide_Wide_String) return Unbounded_Wide_Wide_String
@@ -80,6 +86,34 @@ package body Libadalang.Expr_Eval is
    --  Return ``Self`` as a Boolean, if it is indeed of type
    --  ``Standard.Boolean``.
 
+   function Get_Cached_Eval
+     (D : LAL.Basic_Decl; Cached : out Impl.Static_Eval_Val) return Boolean;
+   --  If the evaluation of ``D`` (with no substitution) is cached in its unit
+   --  and still fresh, store it in ``Cached`` and return True. Return False
+   --  otherwise.
+
+   function From_Cached_Eval
+     (Cached : Impl.Static_Eval_Val) return Eval_Result;
+   --  Return the evaluation result stored in ``Cached``. Raise a
+   --  Property_Error if this evaluation raised one.
+
+   procedure Cache_Eval
+     (D : LAL.Basic_Decl; Result : Eval_Result; Start_Time : Time);
+   --  Store ``Result`` as the evaluation of ``D`` in its unit's cache. The
+   --  evaluation started at ``Start_Time``.
+
+   procedure Cache_Eval_Error (D : LAL.Basic_Decl; Start_Time : Time);
+   --  Record in ``D``'s unit cache that its evaluation, which started at
+   --  ``Start_Time``, raised a Property_Error.
+
+   procedure Add_Compute_Time (D : LAL.Basic_Decl; Start_Time : Time);
+   --  Account for the time spent in an evaluation of ``D`` that started at
+   --  ``Start_Time`` in its unit's cache statistics.
+
+   procedure Store_Cached_Eval
+     (N : Impl.Internal_Entity; V : Impl.Static_Eval_Val);
+   --  Store ``V`` in the cache of ``N``'s unit and record this cache use
+
    ------------------------
    -- Create_Enum_Result --
    ------------------------
@@ -207,6 +241,152 @@ package body Libadalang.Expr_Eval is
          raise Property_Error with "out of range big integer";
    end To_Integer;
 
+   ---------------------
+   -- Get_Cached_Eval --
+   ---------------------
+
+   function Get_Cached_Eval
+     (D : LAL.Basic_Decl; Cached : out Impl.Static_Eval_Val) return Boolean
+   is
+      use type Impl.Env_Rebindings;
+      use type Impl.Version_Number;
+
+      N     : constant Impl.Internal_Entity := Unwrap_Entity (D);
+      C     : constant Impl.Static_Eval_Maps.Cursor :=
+         N.Node.Unit.Static_Evals.Find (N.Node);
+      Stats : Impl.Cache_Usage renames N.Node.Unit.Static_Evals_Stats;
+   begin
+      if Impl.Static_Eval_Maps.Has_Element (C) then
+         Cached := Impl.Static_Eval_Maps.Element (C);
+         if Cached.Cache_Version >= N.Node.Unit.Context.Cache_Version
+            and then Cached.Rebindings = N.Info.Rebindings
+         then
+            Stats.Hits := Stats.Hits + 1;
+            Impl.Extensions.Record_Cache_Use (N.Node.Unit, 0);
+            return True;
+         end if;
+      end if;
+
+      Stats.Misses := Stats.Misses + 1;
+      return False;
+   end Get_Cached_Eval;
+
+   ----------------------
+   -- From_Cached_Eval --
+   ----------------------
+
+   function From_Cached_Eval
+     (Cached : Impl.Static_Eval_Val) return Eval_Result is
+   begin
+      if Cached.Raised_Exc then
+         raise Property_Error with "Memoized Error";
+      end if;
+
+      declare
+         Expr_Type : constant LAL.Base_Type_Decl :=
+            Wrap_Node (Cached.Expr_Type.Node, Cached.Expr_Type.Info)
+            .As_Base_Type_Decl;
+      begin
+         case Expr_Kind'Val (Cached.Kind) is
+            when Enum_Lit =>
+               return Create_Enum_Result
+                 (Expr_Type,
+                  Wrap_Node (Cached.Enum_Result.Node, Cached.Enum_Result.Info)
+                  .As_Enum_Literal_Decl);
+            when Int =>
+               return Create_Int_Result
+                 (Expr_Type,
+                  GNATCOLL.GMP.Integers.Make
+                    (Image (To_Text (Cached.Int_Result))));
+            when Real =>
+               return Create_Real_Result (Expr_Type, Cached.Real_Result);
+            when String_Lit =>
+               return (Kind          => String_Lit,
+                       Expr_Type     => Expr_Type,
+                       String_Result => Cached.String_Result);
+         end case;
+      end;
+   end From_Cached_Eval;
+
+   ----------------
+   -- Cache_Eval --
+   ----------------
+
+   procedure Cache_Eval
+     (D : LAL.Basic_Decl; Result : Eval_Result; Start_Time : Time)
+   is
+      N : constant Impl.Internal_Entity := Unwrap_Entity (D);
+      V : Impl.Static_Eval_Val :=
+        (Cache_Version => N.Node.Unit.Context.Cache_Version,
+         Rebindings    => N.Info.Rebindings,
+         Raised_Exc    => False,
+         Kind          => Expr_Kind'Pos (Result.Kind),
+         Expr_Type     => Unwrap_Entity (Result.Expr_Type),
+         Enum_Result   => Impl.No_Entity,
+         Int_Result    => Null_Unbounded_Wide_Wide_String,
+         Real_Result   => 0.0,
+         String_Result => Null_Unbounded_Wide_Wide_String);
+   begin
+      case Result.Kind is
+         when Enum_Lit =>
+            V.Enum_Result := Unwrap_Entity (Result.Enum_Result);
+         when Int =>
+            V.Int_Result := +To_Text (Result.Int_Result.Image);
+         when Real =>
+            V.Real_Result := Result.Real_Result;
+         when String_Lit =>
+            V.String_Result := Result.String_Result;
+      end case;
+      Store_Cached_Eval (N, V);
+      Add_Compute_Time (D, Start_Time);
+   end Cache_Eval;
+
+   ----------------------
+   -- Cache_Eval_Error --
+   ----------------------
+
+   procedure Cache_Eval_Error (D : LAL.Basic_Decl; Start_Time : Time) is
+      N : constant Impl.Internal_Entity := Unwrap_Entity (D);
+   begin
+      Store_Cached_Eval
+        (N,
+         (Cache_Version => N.Node.Unit.Context.Cache_Version,
+          Rebindings    => N.Info.Rebindings,
+          Raised_Exc    => True,
+          Kind          => 0,
+          Expr_Type     => Impl.No_Entity,
+          Enum_Result   => Impl.No_Entity,
+          Int_Result    => Null_Unbounded_Wide_Wide_String,
+          Real_Result   => 0.0,
+          String_Result => Null_Unbounded_Wide_Wide_String));
+      Add_Compute_Time (D, Start_Time);
+   end Cache_Eval_Error;
+
+   -----------------------
+   -- Store_Cached_Eval --
+   -----------------------
+
+   procedure Store_Cached_Eval
+     (N : Impl.Internal_Entity; V : Impl.Static_Eval_Val)
+   is
+      Length : constant Natural := Natural (N.Node.Unit.Static_Evals.Length);
+   begin
+      N.Node.Unit.Static_Evals.Include (N.Node, V);
+      Impl.Extensions.Record_Cache_Use
+        (N.Node.Unit, Natural (N.Node.Unit.Static_Evals.Length) - Length);
+   end Store_Cached_Eval;
+
+   ----------------------
+   -- Add_Compute_Time --
+   ----------------------
+
+   procedure Add_Compute_Time (D : LAL.Basic_Decl; Start_Time : Time) is
+      Stats : Impl.Cache_Usage renames
+         Unwrap_Node (D).Unit.Static_Evals_Stats;
+   begin
+      Stats.Compute_Time := Stats.Compute_Time + (Clock - Start_Time);
+   end Add_Compute_Time;
+
    ---------------
    -- Expr_Eval --
    ---------------
@@ -227,7 +407,12 @@ package body Libadalang.Expr_Eval is
       --  Reference to either the 'First or the 'Last attribute
 
       function Eval_Decl (D : LAL.Basic_Decl) return Eval_Result;
-      --  Helper to evaluate the value associated to a declaration
+      --  Helper to evaluate the value associated to a declaration. Results
+      --  are cached in the declaration's unit when Env is empty.
+
+      function Eval_Decl_Uncached (D : LAL.Basic_Decl) return Eval_Result;
+      --  Helper for Eval_Decl: evaluate the value associated to a non-null
+      --  declaration for which Env has no substitution.
 
       function Eval_Range_Attr
         (D : LAL.Ada_Node; A : Range_Attr) return Eval_Result;
@@ -258,6 +443,42 @@ package body Libadalang.Expr_Eval is
             end if;
          end loop;
 
+         --  Evaluations in an environment may depend on its substitutions,
+         --  and enum literals are trivial to evaluate: cache only the other
+         --  evaluations in an empty environment, i.e. the ones that re-walk
+         --  default expressions.
+
+         if Env'Length > 0 or else D.Kind = Ada_Enum_Literal_Decl then
+            return Eval_Decl_Uncached (D);
+         end if;
+
+         declare
+            Cached : Impl.Static_Eval_Val;
+         begin
+            if Get_Cached_Eval (D, Cached) then
+               return From_Cached_Eval (Cached);
+            end if;
+         end;
+
+         declare
+            Start_Time : constant Time := Clock;
+         begin
+            return Result : constant Eval_Result := Eval_Decl_Uncached (D) do
+               Cache_Eval (D, Result, Start_Time);
+            end return;
+         exception
+            when Property_Error =>
+               Cache_Eval_Error (D, Start_Time);
+               raise;
+         end;
+      end Eval_Decl;
+
+      ------------------------
+      -- Eval_Decl_Uncached --
+      ------------------------
+
+      function Eval_Decl_Uncached (D : LAL.Basic_Decl) return Eval_Result is
+      begin
          case D.Kind is
             when Ada_Enum_Literal_Decl =>
 
@@ -291,7 +512,7 @@ package body Libadalang.Expr_Eval is
                raise Property_Error
                  with "Cannot eval decl " & D.Kind'Image;
          end case;
-      end Eval_Decl;
+      end Eval_Decl_Uncached;
 
       ---------------------
       -- Eval_Range_Attr --
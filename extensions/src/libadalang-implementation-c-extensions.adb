@@ -21,6 +21,8 @@
 -- <http://www.gnu.org/licenses/>.                                          --
 ------------------------------------------------------------------------------
 
+with Ada.Containers.Vectors;
+with Ada.Exceptions;
 with Ada.Strings.Unbounded;
 with Interfaces.C.Strings; use Interfaces.C.Strings;
 
@@ -28,8 +30,12 @@ with GNATCOLL.Locks;
 with GNATCOLL.Projects; use GNATCOLL.Projects;
 with GNATCOLL.VFS;      use GNATCOLL.VFS;
 
+with Langkit_Support.Text;
+with Langkit_Support.Token_Data_Handlers;
+
 with Libadalang.Analysis;          use Libadalang.Analysis;
 with Libadalang.Auto_Provider;     use Libadalang.Auto_Provider;
+with Libadalang.Expr_Eval;
 with Libadalang.GPR_Lock;
 with Libadalang.Project_Provider;  use Libadalang.Project_Provider;
 with Libadalang.Public_Converters; use Libadalang.Public_Converters;
@@ -319,4 +325,637 @@ package body Libadalang.Implementation.C.Extensions is
       Free (S);
    end ada_free_source_file_array;
 
+   --------------------------
+   -- ada_unit_export_tree --
+   --------------------------
+
+   function ada_unit_export_tree
+     (Unit : ada_analysis_unit) return Tree_Export_Ref_Access
+   is
+      function Count (Node : Bare_Ada_Node) return int;
+      --  Return the number of nodes in the tree rooted at ``Node``
+
+      procedure Fill (Node : Bare_Ada_Node; Parent : int);
+      --  Store data for ``Node`` and its children in ``Result``, starting at
+      --  ``Next``. ``Parent`` is the index of the parent node in the export.
+
+      Root_Node : constant Bare_Ada_Node := Root (Unit);
+      Result    : Tree_Export_Ref_Access;
+      Next      : int := 1;
+
+      -----------
+      -- Count --
+      -----------
+
+      function Count (Node : Bare_Ada_Node) return int is
+         Result : int := 1;
+      begin
+         for I in 1 .. Children_Count (Node) loop
+            declare
+               C : constant Bare_Ada_Node := Child (Node, I);
+            begin
+               if C /= null then
+                  Result := Result + Count (C);
+               end if;
+            end;
+         end loop;
+         return Result;
+      end Count;
+
+      ----------
+      -- Fill --
+      ----------
+
+      procedure Fill (Node : Bare_Ada_Node; Parent : int) is
+         Index : constant int := Next;
+         Sloc  : constant Source_Location_Range := Sloc_Range (Node);
+      begin
+         Next := Next + 1;
+
+         Result.Nodes (Index) := Node;
+         Result.Kinds (Index) := int (Ada_Node_Kind_Type'Enum_Rep (Node.Kind));
+         Result.Parents (Index) := Parent;
+         Result.First_Tokens (Index) := int (Node.Token_Start_Index) - 1;
+         Result.Last_Tokens (Index) :=
+           (if Is_Ghost (Node)
+            then -1
+            else int (Node.Token_End_Index) - 1);
+         Result.Start_Lines (Index) := int (Sloc.Start_Line);
+         Result.Start_Columns (Index) := int (Sloc.Start_Column);
+         Result.End_Lines (Index) := int (Sloc.End_Line);
+         Result.End_Columns (Index) := int (Sloc.End_Column);
+
+         for I in 1 .. Children_Count (Node) loop
+            declare
+               C : constant Bare_Ada_Node := Child (Node, I);
+            begin
+               if C /= null then
+                  Fill (C, Index - 1);
+               end if;
+            end;
+         end loop;
+      end Fill;
+
+   begin
+      Result := new Tree_Export_Ref
+        (if Root_Node = null then 0 else Count (Root_Node));
+      Result.Unit := Unit;
+      Result.Unit_Version := Unit.Unit_Version;
+
+      Result.Kinds_Ptr := Result.Kinds'Address;
+      Result.Parents_Ptr := Result.Parents'Address;
+      Result.First_Tokens_Ptr := Result.First_Tokens'Address;
+      Result.Last_Tokens_Ptr := Result.Last_Tokens'Address;
+      Result.Start_Lines_Ptr := Result.Start_Lines'Address;
+      Result.Start_Columns_Ptr := Result.Start_Columns'Address;
+      Result.End_Lines_Ptr := Result.End_Lines'Address;
+      Result.End_Columns_Ptr := Result.End_Columns'Address;
+
+      if Root_Node /= null then
+         Fill (Root_Node, -1);
+      end if;
+      return Result;
+   end ada_unit_export_tree;
+
+   --------------------------
+   -- ada_tree_export_node --
+   --------------------------
+
+   procedure ada_tree_export_node
+     (Tree   : Tree_Export_Ref_Access;
+      Index  : int;
+      Result : access ada_base_entity) is
+   begin
+      Clear_Last_Exception;
+
+      if Tree.Unit.Unit_Version /= Tree.Unit_Version then
+         raise Stale_Reference_Error with "unit was reparsed since the export";
+      end if;
+
+      Result.all := (Node => Tree.Nodes (Index + 1), Info => No_Entity_Info);
+
+   exception
+      when Exc : Stale_Reference_Error =>
+         Set_Last_Exception (Exc);
+         Result.all := No_Entity;
+   end ada_tree_export_node;
+
+   --------------------------
+   -- ada_free_tree_export --
+   --------------------------
+
+   procedure ada_free_tree_export (Tree : Tree_Export_Ref_Access) is
+      T : Tree_Export_Ref_Access := Tree;
+   begin
+      Free (T);
+   end ada_free_tree_export;
+
+   ----------------------------
+   -- ada_unit_export_tokens --
+   ----------------------------
+
+   function ada_unit_export_tokens
+     (Unit : ada_analysis_unit) return Token_Export_Ref_Access
+   is
+      use Langkit_Support.Token_Data_Handlers;
+
+      TDH     : Token_Data_Handler renames Unit.TDH;
+      Source  : Text_Type renames
+        TDH.Source_Buffer (TDH.Source_First .. TDH.Source_Last);
+      Result  : Token_Export_Ref_Access;
+      Count   : int := 0;
+      Token   : Token_Reference := First_Token (Unit);
+      I       : int := 1;
+   begin
+      while Token /= No_Token loop
+         Count := Count + 1;
+         Token := Next (Token);
+      end loop;
+
+      Result := new Token_Export_Ref (Count, Source'Length);
+      Result.Text := Source;
+
+      Result.Text_Ptr := Result.Text'Address;
+      Result.Kinds_Ptr := Result.Kinds'Address;
+      Result.Is_Trivia_Ptr := Result.Is_Trivia'Address;
+      Result.Indexes_Ptr := Result.Indexes'Address;
+      Result.Start_Offsets_Ptr := Result.Start_Offsets'Address;
+      Result.End_Offsets_Ptr := Result.End_Offsets'Address;
+      Result.Start_Lines_Ptr := Result.Start_Lines'Address;
+      Result.Start_Columns_Ptr := Result.Start_Columns'Address;
+      Result.End_Lines_Ptr := Result.End_Lines'Address;
+      Result.End_Columns_Ptr := Result.End_Columns'Address;
+
+      Token := First_Token (Unit);
+      while Token /= No_Token loop
+         declare
+            TD   : constant Token_Data_Type := Data (Token);
+            Raw  : constant Stored_Token_Data :=
+              Data (Get_Token_Index (Token), TDH);
+            Sloc : constant Source_Location_Range := Sloc_Range (TD);
+         begin
+            Result.Kinds (I) := int (Token_Kind'Enum_Rep (Kind (TD)));
+            Result.Is_Trivia (I) := Boolean'Pos (Is_Trivia (TD));
+            Result.Indexes (I) := int (Index (TD)) - 1;
+            Result.Start_Offsets (I) := int (Raw.Source_First - Source'First);
+            Result.End_Offsets (I) := int (Raw.Source_Last - Source'First + 1);
+            Result.Start_Lines (I) := int (Sloc.Start_Line);
+            Result.Start_Columns (I) := int (Sloc.Start_Column);
+            Result.End_Lines (I) := int (Sloc.End_Line);
+            Result.End_Columns (I) := int (Sloc.End_Column);
+         end;
+         I := I + 1;
+         Token := Next (Token);
+      end loop;
+
+      return Result;
+   end ada_unit_export_tokens;
+
+   ---------------------------
+   -- ada_free_token_export --
+   ---------------------------
+
+   procedure ada_free_token_export (Tokens : Token_Export_Ref_Access) is
+      T : Token_Export_Ref_Access := Tokens;
+   begin
+      Free (T);
+   end ada_free_token_export;
+
+   ---------------------
+   -- ada_unit_source --
+   ---------------------
+
+   procedure ada_unit_source
+     (Unit    : ada_analysis_unit;
+      Text    : access System.Address;
+      Length  : access int;
+      Charset : access chars_ptr)
+   is
+      TDH : Langkit_Support.Token_Data_Handlers.Token_Data_Handler renames
+        Unit.TDH;
+   begin
+      Length.all := int (TDH.Source_Last - TDH.Source_First + 1);
+      Text.all :=
+        (if Length.all = 0
+         then System.Null_Address
+         else TDH.Source_Buffer (TDH.Source_First)'Address);
+      Charset.all :=
+        New_String (Ada.Strings.Unbounded.To_String (Unit.Charset));
+   end ada_unit_source;
+
+   -------------------------
+   -- ada_node_find_kinds --
+   -------------------------
+
+   function ada_node_find_kinds
+     (Node        : ada_base_entity_Ptr;
+      Kinds       : System.Address;
+      Kinds_Count : int;
+      Prune_Kinds : System.Address;
+      Prune_Count : int;
+      Max_Depth   : int;
+      Max_Count   : int;
+      After       : ada_base_entity_Ptr) return Node_Array_Ref_Access
+   is
+      package Node_Vectors is new Ada.Containers.Vectors
+        (Index_Type   => Positive,
+         Element_Type => Bare_Ada_Node);
+
+      type Kind_Set is array (Ada_Node_Kind_Type) of Boolean;
+
+      function To_Set (Kinds : System.Address; Count : int) return Kind_Set;
+      --  Turn the given C array of node kinds into a set
+
+      function Done return Boolean;
+      --  Return whether the traversal found enough nodes
+
+      procedure Visit (Node : Bare_Ada_Node; Depth : int);
+      --  Look for matching nodes in the children of ``Node``, which is at the
+      --  given ``Depth``.
+
+      procedure Visit_Child (C : Bare_Ada_Node; Depth : int);
+      --  Look for matching nodes in the subtree rooted at ``C``, which is at
+      --  the given ``Depth``.
+
+      procedure Resume (Start : Bare_Ada_Node);
+      --  Look for matching nodes in the subtree rooted at ``Start`` (excluded)
+      --  and then in the nodes that follow it in the traversal of ``Node``.
+
+      Sought : Kind_Set;
+      Prune  : Kind_Set;
+      Found  : Node_Vectors.Vector;
+
+      ------------
+      -- To_Set --
+      ------------
+
+      function To_Set (Kinds : System.Address; Count : int) return Kind_Set
+      is
+         Items : Int_Array (1 .. Count)
+            with Import  => True,
+                 Address => Kinds;
+      begin
+         return Result : Kind_Set := (others => False) do
+            for K of Items loop
+               Result (Ada_Node_Kind_Type'Enum_Val (K)) := True;
+            end loop;
+         end return;
+      end To_Set;
+
+      ----------
+      -- Done --
+      ----------
+
+      function Done return Boolean is
+      begin
+         return Max_Count > 0 and then int (Found.Length) >= Max_Count;
+      end Done;
+
+      -----------
+      -- Visit --
+      -----------
+
+      procedure Visit (Node : Bare_Ada_Node; Depth : int) is
+      begin
+         if Max_Depth > 0 and then Depth >= Max_Depth then
+            return;
+         end if;
+
+         for I in 1 .. Children_Count (Node) loop
+            exit when Done;
+            Visit_Child (Child (Node, I), Depth + 1);
+         end loop;
+      end Visit;
+
+      -----------------
+      -- Visit_Child --
+      -----------------
+
+      procedure Visit_Child (C : Bare_Ada_Node; Depth : int) is
+      begin
+         if C /= null then
+            if Sought (C.Kind) then
+               Found.Append (C);
+            end if;
+            if not Prune (C.Kind) then
+               Visit (C, Depth);
+            end if;
+         end if;
+      end Visit_Child;
+
+      ------------
+      -- Resume --
+      ------------
+
+      procedure Resume (Start : Bare_Ada_Node) is
+         N     : Bare_Ada_Node := Start;
+         Depth : int := 0;
+      begin
+         --  Compute the depth of Start, checking that it belongs to the
+         --  traversed subtree.
+
+         while N /= Node.Node loop
+            if N = null then
+               raise Constraint_Error with "invalid traversal resume node";
+            end if;
+            N := N.Parent;
+            Depth := Depth + 1;
+         end loop;
+
+         if Depth > 0 and then not Prune (Start.Kind) then
+            Visit (Start, Depth);
+         end if;
+
+         --  Then go up to the traversal root, visiting the siblings that
+         --  follow the current node at each level.
+
+         N := Start;
+         while N /= Node.Node and then not Done loop
+            declare
+               P    : constant Bare_Ada_Node := N.Parent;
+               Seen : Boolean := False;
+            begin
+               Depth := Depth - 1;
+               for I in 1 .. Children_Count (P) loop
+                  exit when Done;
+                  declare
+                     C : constant Bare_Ada_Node := Child (P, I);
+                  begin
+                     if Seen then
+                        Visit_Child (C, Depth + 1);
+                     elsif C = N then
+                        Seen := True;
+                     end if;
+                  end;
+               end loop;
+               N := P;
+            end;
+         end loop;
+      end Resume;
+
+   begin
+      Clear_Last_Exception;
+
+      begin
+         Sought := To_Set (Kinds, Kinds_Count);
+         Prune := To_Set (Prune_Kinds, Prune_Count);
+
+         if Node.Node /= null then
+            if After = null or else After.Node = null then
+               Visit (Node.Node, 0);
+            else
+               Resume (After.Node);
+            end if;
+         end if;
+      exception
+         when Exc : Constraint_Error =>
+            Set_Last_Exception (Exc);
+            return null;
+      end;
+
+      --  Wrap the nodes found in entities that share the rebindings of the
+      --  traversal root, just like the children of an entity do.
+
+      declare
+         Result : constant Node_Array_Ref_Access :=
+           new Node_Array_Ref (int (Found.Length));
+         I      : int := 1;
+      begin
+         Result.C_Ptr := Result.Items'Address;
+         for N of Found loop
+            Result.Items (I) := (Node => N, Info => Node.Info);
+            I := I + 1;
+         end loop;
+         return Result;
+      end;
+   end ada_node_find_kinds;
+
+   -------------------------
+   -- ada_free_node_array --
+   -------------------------
+
+   procedure ada_free_node_array (Nodes : Node_Array_Ref_Access) is
+      N : Node_Array_Ref_Access := Nodes;
+   begin
+      Free (N);
+   end ada_free_node_array;
+
+   --------------------------------
+   -- ada_expr_eval_as_int_batch --
+   --------------------------------
+
+   function ada_expr_eval_as_int_batch
+     (Exprs : System.Address;
+      Count : int) return Eval_Image_Array_Ref_Access
+   is
+      package Eval renames Libadalang.Expr_Eval;
+
+      Items  : Entity_Array (1 .. Count)
+         with Import  => True,
+              Address => Exprs;
+      Result : Eval_Image_Array_Ref_Access :=
+         new Eval_Image_Array_Ref (Count);
+   begin
+      Clear_Last_Exception;
+
+      Result.C_Ptr := Result.Items'Address;
+      Result.Items := (others => Null_Ptr);
+      for I in Items'Range loop
+         declare
+            E : constant Expr :=
+               Wrap_Node (Items (I).Node, Items (I).Info).As_Expr;
+         begin
+            Result.Items (I) :=
+               New_String (Eval.As_Int (Eval.Expr_Eval (E)).Image);
+         exception
+            when Property_Error =>
+               null;
+         end;
+      end loop;
+      return Result;
+
+   exception
+      when Exc : others =>
+         --  One of the nodes is not an expression, it belongs to a unit that
+         --  was reparsed, or its evaluation failed unexpectedly. Do not let
+         --  the exception propagate through the C API.
+
+         ada_free_eval_image_array (Result);
+         Set_Last_Exception (Exc);
+         return null;
+   end ada_expr_eval_as_int_batch;
+
+   -------------------------------
+   -- ada_free_eval_image_array --
+   -------------------------------
+
+   procedure ada_free_eval_image_array (Images : Eval_Image_Array_Ref_Access)
+   is
+      I : Eval_Image_Array_Ref_Access := Images;
+   begin
+      for Image of I.Items loop
+         Free (Image);
+      end loop;
+      Free (I);
+   end ada_free_eval_image_array;
+
+   --------------------------
+   -- ada_node_query_batch --
+   --------------------------
+
+   function ada_node_query_batch
+     (Nodes   : System.Address;
+      Count   : int;
+      Queries : int) return Node_Query_Ref_Access
+   is
+      Items  : Entity_Array (1 .. Count)
+         with Import  => True,
+              Address => Nodes;
+      Result : constant Node_Query_Ref_Access := new Node_Query_Ref (Count);
+
+      function Selected (Flag : int) return Boolean
+      is ((Queries / Flag) mod 2 = 1);
+      --  Return whether the query for Flag is selected
+
+   begin
+      Clear_Last_Exception;
+
+      Result.Decls_Ptr := Result.Decls'Address;
+      Result.Types_Ptr := Result.Types'Address;
+      Result.Names_Ptr := Result.Names'Address;
+      Result.Errors_Ptr := Result.Errors'Address;
+      Result.Decls := (others => No_Entity);
+      Result.Types := (others => No_Entity);
+      Result.Names := (others => Null_Ptr);
+      Result.Errors := (others => Null_Ptr);
+
+      for I in Items'Range loop
+         declare
+            Node        : constant Ada_Node :=
+               Wrap_Node (Items (I).Node, Items (I).Info);
+            Is_Defining : Boolean;
+            Decl        : Basic_Decl;
+         begin
+            if not Node.Is_Null then
+               Is_Defining :=
+                  Node.Kind in Ada_Name and then Node.As_Name.P_Is_Defining;
+
+               --  Defining names and declarations designate themselves. For
+               --  other names, use the failsafe property so that a failure of
+               --  name resolution is reported as an error for this node,
+               --  rather than as a null referenced declaration.
+
+               if Is_Defining then
+                  Decl := Node.As_Name.P_Enclosing_Defining_Name.P_Basic_Decl;
+               elsif Node.Kind in Ada_Name then
+                  declare
+                     Ref : constant Refd_Decl :=
+                        Node.As_Name.P_Failsafe_Referenced_Decl;
+                  begin
+                     if Kind (Ref) = Libadalang.Common.Error then
+                        raise Property_Error with "name resolution failed";
+                     end if;
+                     Decl := Libadalang.Analysis.Decl (Ref);
+                  end;
+               elsif Node.Kind in Ada_Basic_Decl then
+                  Decl := Node.As_Basic_Decl;
+               end if;
+
+               if Selected (Query_Referenced_Decl) then
+                  Result.Decls (I) := Unwrap_Entity (Decl);
+               end if;
+               if Selected (Query_Expression_Type)
+                 and then Node.Kind in Ada_Expr
+               then
+                  Result.Types (I) :=
+                     Unwrap_Entity (Node.As_Expr.P_Expression_Type);
+               end if;
+               if Selected (Query_Fully_Qualified_Name)
+                 and then not Decl.Is_Null
+               then
+                  Result.Names (I) := New_String
+                    (Langkit_Support.Text.To_UTF8
+                       (Decl.P_Fully_Qualified_Name));
+               end if;
+            end if;
+
+         exception
+            when Exc : Property_Error =>
+               Result.Decls (I) := No_Entity;
+               Result.Types (I) := No_Entity;
+               Free (Result.Names (I));
+               Result.Errors (I) :=
+                  New_String (Ada.Exceptions.Exception_Message (Exc));
+         end;
+      end loop;
+      return Result;
+
+   exception
+      when Exc : others =>
+         ada_free_node_query (Result);
+         Set_Last_Exception (Exc);
+         return null;
+   end ada_node_query_batch;
+
+   -------------------------
+   -- ada_free_node_query --
+   -------------------------
+
+   procedure ada_free_node_query (Query : Node_Query_Ref_Access) is
+      Q : Node_Query_Ref_Access := Query;
+   begin
+      for S of Q.Names loop
+         Free (S);
+      end loop;
+      for S of Q.Errors loop
+         Free (S);
+      end loop;
+      Free (Q);
+   end ada_free_node_query;
+
+   ----------------------------------
+   -- ada_context_cache_statistics --
+   ----------------------------------
+
+   procedure ada_context_cache_statistics
+     (Context : ada_analysis_context;
+      Kind    : int;
+      Result  : access ada_cache_statistics)
+   is
+      K     : Cache_Kind;
+      Stats : Cache_Statistics;
+   begin
+      Clear_Last_Exception;
+
+      begin
+         K := Cache_Kind'Val (Kind);
+      exception
+         when Exc : Constraint_Error =>
+            Set_Last_Exception (Exc);
+            return;
+      end;
+
+      Stats := Get_Cache_Statistics (Wrap_Context (Context), K);
+      Result.all :=
+        (Entries      => int (Stats.Entries),
+         Hits         => Interfaces.Unsigned_64 (Stats.Hits),
+         Misses       => Interfaces.Unsigned_64 (Stats.Misses),
+         Memory       => size_t (Stats.Memory),
+         Compute_Time => double (Stats.Compute_Time));
+   end ada_context_cache_statistics;
+
+   ----------------------------------
+   -- ada_context_set_cache_budget --
+   ----------------------------------
+
+   procedure ada_context_set_cache_budget
+     (Context : ada_analysis_context; Max_Entries : int) is
+   begin
+      Clear_Last_Exception;
+      Set_Cache_Budget (Wrap_Context (Context), Natural (Max_Entries));
+   exception
+      when Exc : Constraint_Error =>
+         Set_Last_Exception (Exc);
+   end ada_context_set_cache_budget;
+
 end Libadalang.Implementation.C.Extensions;
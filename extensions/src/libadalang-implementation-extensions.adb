@@ -21,6 +21,7 @@
 -- <http://www.gnu.org/licenses/>.                                          --
 ------------------------------------------------------------------------------
 
+with Ada.Calendar;
 with Ada.Containers.Vectors;
 with Ada.Directories;
 with Ada.Strings.Wide_Wide_Unbounded;
@@ -635,6 +636,79 @@ package body Libadalang.Implementation.Extensions is
       end return;
    end Expr_P_Type_Var;
 
+   ----------------------
+   -- Record_Cache_Use --
+   ----------------------
+
+   procedure Record_Cache_Use (Unit : Internal_Unit; New_Entries : Integer) is
+      Context : constant Internal_Context := Unit.Context;
+      Target  : Natural;
+   begin
+      Context.Cache_Clock := Context.Cache_Clock + 1;
+      Unit.Last_Cache_Use := Context.Cache_Clock;
+      Context.Cache_Entries := Context.Cache_Entries + New_Entries;
+
+      --  Only insertions can make the caches exceed the budget
+
+      if Context.Cache_Budget = 0
+         or else New_Entries <= 0
+         or else Context.Cache_Entries <= Context.Cache_Budget
+      then
+         return;
+      end if;
+
+      --  Caches may have been emptied without going through this procedure
+      --  (for instance when units are destroyed), so the running count can
+      --  only overestimate the number of entries. Count them again before
+      --  evicting anything. Since evictions go down to 3/4 of the budget,
+      --  this happens at most once every Budget / 4 insertions unless caches
+      --  are emptied elsewhere, so the cost of going through all units is
+      --  amortized.
+
+      Context.Cache_Entries := 0;
+      for U of Context.Units loop
+         Context.Cache_Entries := Context.Cache_Entries
+                                  + Natural (U.Nodes_Nameres.Length)
+                                  + Natural (U.Static_Evals.Length);
+      end loop;
+      if Context.Cache_Entries <= Context.Cache_Budget then
+         return;
+      end if;
+
+      --  Evict down to 3/4 of the budget, so that the cost of looking for
+      --  least recently used units is amortized over several insertions.
+      --  Evicting cache entries is always safe: results are just recomputed
+      --  on the next lookup.
+
+      Target := Context.Cache_Budget - Context.Cache_Budget / 4;
+      while Context.Cache_Entries > Target loop
+         declare
+            LRU : Internal_Unit := null;
+         begin
+            for U of Context.Units loop
+               if U /= Unit
+                  and then (not U.Nodes_Nameres.Is_Empty
+                            or else not U.Static_Evals.Is_Empty)
+                  and then (LRU = null
+                            or else U.Last_Cache_Use < LRU.Last_Cache_Use)
+               then
+                  LRU := U;
+               end if;
+            end loop;
+
+            --  Never clear the caches of Unit, which are in use
+
+            exit when LRU = null;
+
+            Context.Cache_Entries := Context.Cache_Entries
+                                     - Natural (LRU.Nodes_Nameres.Length)
+                                     - Natural (LRU.Static_Evals.Length);
+            LRU.Nodes_Nameres.Clear;
+            LRU.Static_Evals.Clear;
+         end;
+      end loop;
+   end Record_Cache_Use;
+
    ----------------------------------
    -- Ada_Node_P_Resolve_Own_Names --
    ----------------------------------
@@ -649,6 +723,45 @@ package body Libadalang.Implementation.Extensions is
 
       R : Relation;
       C : constant Cursor := Node.Unit.Nodes_Nameres.Find (Node);
+
+      Computing  : Boolean := False;
+      Start_Time : Ada.Calendar.Time;
+      --  Whether there was a cache miss, and if so, time at which the
+      --  resolution started.
+
+      procedure Add_Compute_Time;
+      --  If there was a cache miss, account for the time spent in this
+      --  resolution in Node's unit cache statistics.
+
+      procedure Cache_Result (Value : Resolution_Val);
+      --  Store Value in the cache for Node and record this cache use
+
+      ----------------------
+      -- Add_Compute_Time --
+      ----------------------
+
+      procedure Add_Compute_Time is
+         use type Ada.Calendar.Time;
+         Stats : Cache_Usage renames Node.Unit.Nodes_Nameres_Stats;
+      begin
+         if Computing then
+            Stats.Compute_Time :=
+               Stats.Compute_Time + (Ada.Calendar.Clock - Start_Time);
+         end if;
+      end Add_Compute_Time;
+
+      ------------------
+      -- Cache_Result --
+      ------------------
+
+      procedure Cache_Result (Value : Resolution_Val) is
+         Length : constant Natural := Natural (Node.Unit.Nodes_Nameres.Length);
+      begin
+         Node.Unit.Nodes_Nameres.Include (Node, Value);
+         Record_Cache_Use
+           (Node.Unit, Natural (Node.Unit.Nodes_Nameres.Length) - Length);
+      end Cache_Result;
+
    begin
       --  There was already resolution for this node, and it's the same
       --  rebindings, and the cache key is still fresh: just return
@@ -661,6 +774,9 @@ package body Libadalang.Implementation.Extensions is
          declare
             Res_Val : constant Resolution_Val := Nameres_Maps.Element (C);
          begin
+            Node.Unit.Nodes_Nameres_Stats.Hits :=
+               Node.Unit.Nodes_Nameres_Stats.Hits + 1;
+            Record_Cache_Use (Node.Unit, 0);
             if Res_Val.Raised_Exc then
                raise Property_Error with "Memoized Error";
             end if;
@@ -669,6 +785,11 @@ package body Libadalang.Implementation.Extensions is
          end;
       end if;
 
+      Node.Unit.Nodes_Nameres_Stats.Misses :=
+         Node.Unit.Nodes_Nameres_Stats.Misses + 1;
+      Computing := True;
+      Start_Time := Ada.Calendar.Clock;
+
       R := Dispatcher_Ada_Node_P_Xref_Equation (Node, Env, Origin, E_Info);
 
       --  There was no resolution, or if there was it was for different
@@ -676,19 +797,19 @@ package body Libadalang.Implementation.Extensions is
       --  mmz map.
       return Res : constant Boolean := Solve_Wrapper (R,  Node) do
          Dec_Ref (R);
-         Node.Unit.Nodes_Nameres.Include
-           (Node,
-            (Node.Unit.Context.Cache_Version, E_Info.Rebindings, Res, False));
+         Cache_Result
+           ((Node.Unit.Context.Cache_Version, E_Info.Rebindings, Res, False));
+         Add_Compute_Time;
       end return;
 
    exception
       when Property_Error =>
          Dec_Ref (R);
+         Add_Compute_Time;
          --  Memoize the exception result, to be able to re-raise a
          --  property_error if this is called again with the same params.
-         Node.Unit.Nodes_Nameres.Include
-           (Node,
-            (Node.Unit.Context.Cache_Version,
+         Cache_Result
+           ((Node.Unit.Context.Cache_Version,
              E_Info.Rebindings, False, Raised_Exc => True));
          raise;
    end Ada_Node_P_Resolve_Own_Names;
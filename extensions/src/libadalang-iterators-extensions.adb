@@ -100,11 +100,33 @@ package body Libadalang.Iterators.Extensions is
 
    function Xref_Is
      (Name               : Defining_Name;
-      Imprecise_Fallback : Boolean := False) return Ada_Node_Predicate is
+      Imprecise_Fallback : Boolean := False) return Ada_Node_Predicate
+   is
+      Symbol : Symbol_Type := null;
    begin
+      if not Name.Is_Null then
+         declare
+            N : constant Libadalang.Analysis.Name := Name.F_Name;
+         begin
+            case N.Kind is
+               when Ada_Identifier =>
+                  Symbol := Single_Tok_Node_P_Sym (Unwrap_Node (N));
+               when Ada_Dotted_Name =>
+                  if N.As_Dotted_Name.F_Suffix.Kind = Ada_Identifier then
+                     Symbol := Single_Tok_Node_P_Sym
+                       (Unwrap_Node (N.As_Dotted_Name.F_Suffix));
+                  end if;
+               when others =>
+                  null;
+            end case;
+         end;
+      end if;
+
       return Result : Ada_Node_Predicate do
          Result.Set (Xref_Predicate'
-           (Name => Name, Imprecise_Fallback => Imprecise_Fallback));
+           (Name               => Name,
+            Imprecise_Fallback => Imprecise_Fallback,
+            Symbol             => Symbol));
       end return;
    end Xref_Is;
 
@@ -113,10 +135,54 @@ package body Libadalang.Iterators.Extensions is
    --------------
 
    overriding function Evaluate
-     (P : in out Xref_Predicate; N : Ada_Node) return Boolean is
+     (P : in out Xref_Predicate; N : Ada_Node) return Boolean
+   is
+      function Is_In_Defining_Name (Id : Ada_Node) return Boolean;
+      --  Return whether Id is part of a defining name
+
+      -------------------------
+      -- Is_In_Defining_Name --
+      -------------------------
+
+      function Is_In_Defining_Name (Id : Ada_Node) return Boolean is
+         Parent : Ada_Node := Id.Parent;
+      begin
+         while not Parent.Is_Null and then Parent.Kind = Ada_Dotted_Name loop
+            Parent := Parent.Parent;
+         end loop;
+         return not Parent.Is_Null and then Parent.Kind = Ada_Defining_Name;
+      end Is_In_Defining_Name;
+
    begin
-      return not N.Is_Null
-             and then N.P_Gnat_Xref (P.Imprecise_Fallback) = P.Name;
+      if N.Is_Null then
+         return False;
+      end if;
+
+      --  Filter out nodes that cannot reference P.Name before running name
+      --  resolution. P_Gnat_Xref returns null for all nodes that are not
+      --  names.
+
+      if not P.Name.Is_Null then
+         if N.Kind not in Ada_Name then
+            return False;
+         end if;
+
+         --  Identifiers that are not part of a defining name can reference
+         --  only declarations with the same name. Identifiers in defining
+         --  names may reference other declarations (for instance a
+         --  subprogram for its formals), so do not filter them out.
+
+         if P.Symbol /= null
+            and then N.Kind = Ada_Identifier
+            and then N.Unit.Context = P.Name.Unit.Context
+            and then Single_Tok_Node_P_Sym (Unwrap_Node (N)) /= P.Symbol
+            and then not Is_In_Defining_Name (N)
+         then
+            return False;
+         end if;
+      end if;
+
+      return N.P_Gnat_Xref (P.Imprecise_Fallback) = P.Name;
    exception
       when Property_Error =>
          return False;
@@ -27,6 +27,61 @@ with Langkit_Support.Errors; use Langkit_Support.Errors;
 
 package body Libadalang.Sources is
 
+   subtype ASCII_Character is Wide_Wide_Character
+      range Wide_Wide_Character'Val (0) .. Wide_Wide_Character'Val (127);
+
+   type ASCII_Case_Table is array (ASCII_Character) of ASCII_Character;
+
+   function Create_Lower_Table return ASCII_Case_Table;
+   --  Return a table that maps all ASCII characters to their lower case
+   --  counterpart.
+
+   Lower_Table : constant ASCII_Case_Table := Create_Lower_Table;
+
+   function Is_Plain_ASCII
+     (Name : Text_Type; Has_Upper : out Boolean) return Boolean
+      with Inline;
+   --  Return whether Name contains only ASCII characters and no brackets
+   --  encoding. If it is the case, set Has_Upper to whether it contains upper
+   --  case letters.
+
+   ------------------------
+   -- Create_Lower_Table --
+   ------------------------
+
+   function Create_Lower_Table return ASCII_Case_Table is
+   begin
+      return Result : ASCII_Case_Table do
+         for C in Result'Range loop
+            Result (C) :=
+              (if C in 'A' .. 'Z'
+               then Wide_Wide_Character'Val
+                      (Wide_Wide_Character'Pos (C)
+                       - Wide_Wide_Character'Pos ('A')
+                       + Wide_Wide_Character'Pos ('a'))
+               else C);
+         end loop;
+      end return;
+   end Create_Lower_Table;
+
+   --------------------
+   -- Is_Plain_ASCII --
+   --------------------
+
+   function Is_Plain_ASCII
+     (Name : Text_Type; Has_Upper : out Boolean) return Boolean is
+   begin
+      Has_Upper := False;
+      for C of Name loop
+         if C not in ASCII_Character or else C = '[' then
+            return False;
+         elsif C in 'A' .. 'Z' then
+            Has_Upper := True;
+         end if;
+      end loop;
+      return True;
+   end Is_Plain_ASCII;
+
    ---------------------
    -- Decode_Brackets --
    ---------------------
@@ -91,54 +146,77 @@ package body Libadalang.Sources is
    ------------------
 
    function Canonicalize (Name : Text_Type) return Symbolization_Result is
-      Result      : Text_Type (Name'Range);
-      Result_Last : Integer := Name'First - 1;
-
-      I : Positive := Name'First;
+      Has_Upper : Boolean;
    begin
-      --  Decode bracket encodings
-
-      while I <= Name'Last loop
+      --  Fast path for names with only ASCII characters and no brackets
+      --  encoding, i.e. nearly all identifiers: use a lookup table for case
+      --  folding, and do not copy names that are already lower case.
 
-         --  First, try to decode a brackets encoded char, if any
+      if Is_Plain_ASCII (Name, Has_Upper) then
+         if not Has_Upper then
+            return Create_Symbol (Name);
+         end if;
 
-         Result_Last := Result_Last + 1;
          declare
-            C     : constant Wide_Wide_Character := Name (I);
-            J     : Positive := I + 1;
-            Error : Boolean;
+            Result : Text_Type (Name'Range);
          begin
-            if C = '['
-               and then J in Name'Range
-               and then Name (J) = '"'
-            then
-               --  If we have the [" sequence, start decoding the brackets
-               --  construct.
-
-               while J < Name'Last and then Name (J) /= ']' loop
-                  J := J + 1;
-               end loop;
-               Decode_Brackets (Name (I .. J), Error, Result (Result_Last));
-               if Error then
-                  return Create_Error ("invalid brackets encoding");
-               end if;
-               I := J;
+            for I in Name'Range loop
+               Result (I) := Lower_Table (Name (I));
+            end loop;
+            return Create_Symbol (Result);
+         end;
+      end if;
 
-            else
-               --  Otherwise, just copy the chararcters
+      declare
+         Result      : Text_Type (Name'Range);
+         Result_Last : Integer := Name'First - 1;
 
-               Result (Result_Last) := C;
-            end if;
-         end;
+         I : Positive := Name'First;
+      begin
+         --  Decode bracket encodings
 
-         --  Now, perform case folding
+         while I <= Name'Last loop
 
-         Result (Result_Last) := To_Lower (Result (Result_Last));
+            --  First, try to decode a brackets encoded char, if any
 
-         I := I + 1;
-      end loop;
+            Result_Last := Result_Last + 1;
+            declare
+               C     : constant Wide_Wide_Character := Name (I);
+               J     : Positive := I + 1;
+               Error : Boolean;
+            begin
+               if C = '['
+                  and then J in Name'Range
+                  and then Name (J) = '"'
+               then
+                  --  If we have the [" sequence, start decoding the brackets
+                  --  construct.
+
+                  while J < Name'Last and then Name (J) /= ']' loop
+                     J := J + 1;
+                  end loop;
+                  Decode_Brackets (Name (I .. J), Error, Result (Result_Last));
+                  if Error then
+                     return Create_Error ("invalid brackets encoding");
+                  end if;
+                  I := J;
 
-      return Create_Symbol (Result (Result'First .. Result_Last));
+               else
+                  --  Otherwise, just copy the chararcters
+
+                  Result (Result_Last) := C;
+               end if;
+            end;
+
+            --  Now, perform case folding
+
+            Result (Result_Last) := To_Lower (Result (Result_Last));
+
+            I := I + 1;
+         end loop;
+
+         return Create_Symbol (Result (Result'First .. Result_Last));
+      end;
    end Canonicalize;
 
    ------------------------------
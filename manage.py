@@ -144,7 +144,8 @@ class Manage(ManageScript):
     @property
     def main_programs(self):
         return super(Manage, self).main_programs | {'nameres', 'navigate',
-                                                    'gnat_compare'}
+                                                    'gnat_compare',
+                                                    'parse_profile'}
 
     def do_generate(self, args):
         # Always generate the unparsing machinery and report unused
@@ -178,6 +179,7 @@ class Manage(ManageScript):
             "check_useless_assign.py",
             "detect_copy_paste_sa.py",
             "highlight",
+            "lal_server",
         ]:
             item_from = self.dirs.lang_source_dir("contrib", item)
             item_to = os.path.join(examples_dir, item)
@@ -1,5 +1,7 @@
+with Ada.Exceptions;
 with Ada.Strings.Unbounded; use Ada.Strings.Unbounded;
 with Ada.Text_IO;           use Ada.Text_IO;
+with System.Multiprocessors;
 
 with GNAT.OS_Lib; use GNAT.OS_Lib;
 
@@ -73,6 +75,13 @@ procedure GNAT_Compare is
       package Skip_Build is new Parse_Flag
         (App.Args.Parser, "-b", "--skip-build",
          "Skip the build of the project to process");
+
+      package LI_Jobs is new Parse_Option
+        (App.Args.Parser, Long => "--li-jobs",
+         Help        => "Number of parallel jobs to use to read library"
+                        & " files. If zero, create one job per CPU.",
+         Arg_Type    => Natural,
+         Default_Val => 0);
    end Args;
 
    Enabled : Comparison_Set := (others => True);
@@ -315,16 +324,91 @@ procedure GNAT_Compare is
       Xrefs        : out Unit_Xrefs_Vectors.Vector;
       Source_Files : String_Vectors.Vector)
    is
-      LIs : Library_Info_List;
+      LIs          : Library_Info_List;
+      LI_Filenames : String_Vectors.Vector;
    begin
       Project.Root_Project.Library_Files (List => LIs);
       for LI of LIs loop
+         LI_Filenames.Append (+(+Full_Name (LI.Library_File)));
+      end loop;
+      LIs.Clear;
+
+      --  Read LI files in parallel: each reader task processes whole LI
+      --  files, using its own file table. Then merge the results in the order
+      --  of LI files, so that the result does not depend on scheduling.
+
+      declare
+         type LI_Result is limited record
+            Files : File_Table_Type;
+            Xrefs : Unit_Xrefs_Vectors.Vector;
+
+            Error : Ada.Exceptions.Exception_Occurrence;
+            Has_Error : Boolean := False;
+            --  Exception raised while reading this LI file, if any
+         end record;
+
+         Results : array (1 .. LI_Filenames.Last_Index) of LI_Result;
+
+         protected Queue is
+            procedure Next (Index : out Natural);
+            --  Return the index of the next LI file to read, or 0 if all LI
+            --  files are being read.
+         private
+            Next_Index : Positive := 1;
+         end Queue;
+
+         protected body Queue is
+            procedure Next (Index : out Natural) is
+            begin
+               if Next_Index > Results'Last then
+                  Index := 0;
+               else
+                  Index := Next_Index;
+                  Next_Index := Next_Index + 1;
+               end if;
+            end Next;
+         end Queue;
+
+         task type Reader;
+
+         task body Reader is
+            Index : Natural;
+         begin
+            loop
+               Queue.Next (Index);
+               exit when Index = 0;
+
+               declare
+                  R : LI_Result renames Results (Index);
+               begin
+                  Read_LI_Xrefs (+LI_Filenames (Index), R.Files, R.Xrefs);
+               exception
+                  when E : others =>
+                     Ada.Exceptions.Save_Occurrence (R.Error, E);
+                     R.Has_Error := True;
+               end;
+            end loop;
+         end Reader;
+
+         Reader_Count : constant Positive :=
+           (if Args.LI_Jobs.Get = 0
+            then Positive (System.Multiprocessors.Number_Of_CPUs)
+            else Args.LI_Jobs.Get);
+      begin
          declare
-            LI_Filename : constant String := +Full_Name (LI.Library_File);
-            New_Xrefs   : Unit_Xrefs_Vectors.Vector;
+            Readers : array (1 .. Reader_Count) of Reader;
+            pragma Unreferenced (Readers);
          begin
-            Read_LI_Xrefs (LI_Filename, Files, New_Xrefs);
-            for NX of New_Xrefs loop
+            null;
+         end;
+
+         for R of Results loop
+            if R.Has_Error then
+               Ada.Exceptions.Reraise_Occurrence (R.Error);
+            end if;
+
+            Import_Xrefs (Files, R.Files, R.Xrefs);
+            for NX of R.Xrefs loop
                if Source_Files.Is_Empty
                  or else Source_Files.Contains (+Filename (Files, NX.Unit))
                then
@@ -333,9 +417,8 @@ procedure GNAT_Compare is
                   Free (NX);
                end if;
             end loop;
-         end;
-      end loop;
-      LIs.Clear;
+         end loop;
+      end;
    end Load_All_Xrefs_From_LI;
 
    -------------------
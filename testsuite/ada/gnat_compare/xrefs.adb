@@ -1,9 +1,9 @@
 with Ada.Characters.Handling;
 with Ada.Containers.Generic_Sort;
-with Ada.IO_Exceptions;
 with Ada.Text_IO; use Ada.Text_IO;
 
-with GNATCOLL.VFS; use GNATCOLL.VFS;
+with GNATCOLL.Mmap; use GNATCOLL.Mmap;
+with GNATCOLL.VFS;  use GNATCOLL.VFS;
 
 package body Xrefs is
 
@@ -139,7 +139,6 @@ package body Xrefs is
       Files       : in out File_Table_Type;
       Xrefs       : out Unit_Xrefs_Vectors.Vector)
    is
-      File     : File_Type;
       Unit_Map : String_Maps.Map;
       Deps     : Deps_Vectors.Vector;
 
@@ -152,6 +151,7 @@ package body Xrefs is
 
       procedure Set_Ref_File (Index : File_Index_Type);
       procedure Process_Xref (S : String);
+      procedure Process_Line (Line : String);
 
       ------------------
       -- Set_Ref_File --
@@ -225,165 +225,213 @@ package body Xrefs is
          end if;
       end Process_Xref;
 
-   begin
-      Open (File, In_File, LI_Filename);
-      loop
-         begin
+      ------------------
+      -- Process_Line --
+      ------------------
+
+      procedure Process_Line (Line : String) is
+         Line_Letter : constant Character :=
+           (if Line'Length > 0
+            then Line (Line'First)
+            else ASCII.NUL);
+      begin
+         if Line'Length = 0 then
+            In_Xref := False;
+         end if;
+
+         case Line_Letter is
+         when 'U' =>
             declare
-               Line        : constant String := Get_Line (File);
-               Line_Letter : constant Character :=
-                 (if Line'Length > 0
-                  then Line (Line'First)
-                  else ASCII.NUL);
+               Chunks   : constant Slice_Array := Split (Line);
+               Filename : constant String := Get (Line, Chunks (3));
             begin
-               if Line'Length = 0 then
-                  In_Xref := False;
-               end if;
-
-               case Line_Letter is
-               when 'U' =>
-                  declare
-                     Chunks   : constant Slice_Array := Split (Line);
-                     Filename : constant String := Get (Line, Chunks (3));
-                  begin
-                     Xrefs.Append (new Unit_Xrefs_Type'
-                                     (Unit  => File_Index (Files, Filename),
-                                      Xrefs => <>));
-                     Unit_Map.Insert (+Filename, Xrefs.Last_Index);
-                  end;
+               Xrefs.Append (new Unit_Xrefs_Type'
+                               (Unit  => File_Index (Files, Filename),
+                                Xrefs => <>));
+               Unit_Map.Insert (+Filename, Xrefs.Last_Index);
+            end;
 
-               when 'D' =>
-                  declare
-                     Chunks   : constant Slice_Array := Split (Line);
-                     Filename : constant String := Get (Line, Chunks (2));
-                     Index    : constant File_Index_Type :=
-                       File_Index (Files, Filename);
-                  begin
-                     Deps.Append (Index);
-                  end;
+         when 'D' =>
+            declare
+               Chunks   : constant Slice_Array := Split (Line);
+               Filename : constant String := Get (Line, Chunks (2));
+               Index    : constant File_Index_Type :=
+                 File_Index (Files, Filename);
+            begin
+               Deps.Append (Index);
+            end;
 
-               when 'X' =>
-                  In_Xref := True;
-                  declare
-                     Chunks : constant Slice_Array := Split (Line);
-                     Dep    : constant Dep_Index_Type :=
-                       Dep_Index_Type'Value (Get (Line, Chunks (2)));
-                  begin
-                     Current_File := Deps (Dep);
-                  end;
+         when 'X' =>
+            In_Xref := True;
+            declare
+               Chunks : constant Slice_Array := Split (Line);
+               Dep    : constant Dep_Index_Type :=
+                 Dep_Index_Type'Value (Get (Line, Chunks (2)));
+            begin
+               Current_File := Deps (Dep);
+            end;
 
-               when '.' =>
-                  if In_Xref then
-                     if Line (Line'First .. Line'First + 1) /= ". " then
-                        raise Program_Error;
-                     end if;
+         when '.' =>
+            if In_Xref then
+               if Line (Line'First .. Line'First + 1) /= ". " then
+                  raise Program_Error;
+               end if;
 
-                     for Chunk of Split (Line (Line'First + 2 .. Line'Last))
+               for Chunk of Split (Line (Line'First + 2 .. Line'Last))
+               loop
+                  Process_Xref (Get (Line, Chunk));
+               end loop;
+            end if;
+
+         when others =>
+            if In_Xref then
+               declare
+                  Cursor     : Natural := Line'First;
+                  Line_Nbr   : constant Natural :=
+                    Read_Natural (Line, Cursor);
+                  Type_Char  : constant Character :=
+                    Read_Character (Line, Cursor)
+                    with Unreferenced;
+                  Column     : constant Natural :=
+                    Read_Natural (Line, Cursor);
+                  Level_Char : constant Character :=
+                    Read_Character (Line, Cursor)
+                    with Unreferenced;
+               begin
+                  Set_Ref_File (Current_File);
+                  Entity_File := Current_File;
+                  Entity_Sloc :=
+                    (Line_Number (Line_Nbr), Column_Number (Column));
+                  --  First chunk is the entity name: skip it, the rest
+                  --  is the actual xref data.
+
+                  --  Skip the entity name (either regular identifier or
+                  --  "XXX")...
+                  if Line (Cursor) = '"' then
+                     Cursor := Cursor + 1;
+                     Skip_Until (Line, Cursor, '"');
+                     Cursor := Cursor + 1;
+                  else
+                     while
+                       Cursor <= Line'Last
+                       and then
+                         (Ada.Characters.Handling.Is_Alphanumeric
+                            (Line (Cursor))
+                          or else Line (Cursor) = '_')
                      loop
-                        Process_Xref (Get (Line, Chunk));
+                        Cursor := Cursor + 1;
                      end loop;
                   end if;
 
-               when others =>
-                  if In_Xref then
+                  --  ... and the potential suffixes: renameref
+                  --  (=line:col).
+                  if Cursor <= Line'Last and then Line (Cursor) = '='
+                  then
                      declare
-                        Cursor     : Natural := Line'First;
-                        Line_Nbr   : constant Natural :=
-                          Read_Natural (Line, Cursor);
-                        Type_Char  : constant Character :=
-                          Read_Character (Line, Cursor)
-                          with Unreferenced;
-                        Column     : constant Natural :=
-                          Read_Natural (Line, Cursor);
-                        Level_Char : constant Character :=
-                          Read_Character (Line, Cursor)
-                          with Unreferenced;
-                     begin
-                        Set_Ref_File (Current_File);
-                        Entity_File := Current_File;
-                        Entity_Sloc :=
-                          (Line_Number (Line_Nbr), Column_Number (Column));
-                        --  First chunk is the entity name: skip it, the rest
-                        --  is the actual xref data.
-
-                        --  Skip the entity name (either regular identifier or
-                        --  "XXX")...
-                        if Line (Cursor) = '"' then
-                           Cursor := Cursor + 1;
-                           Skip_Until (Line, Cursor, '"');
-                           Cursor := Cursor + 1;
-                        else
-                           while
-                             Cursor <= Line'Last
-                             and then
-                               (Ada.Characters.Handling.Is_Alphanumeric
-                                  (Line (Cursor))
-                                or else Line (Cursor) = '_')
-                           loop
-                              Cursor := Cursor + 1;
-                           end loop;
-                        end if;
+                        Dummy_Char : constant Character :=
+                          Read_Character (Line, Cursor);
+                        pragma Assert (Dummy_Char = '=');
 
-                        --  ... and the potential suffixes: renameref
-                        --  (=line:col).
-                        if Cursor <= Line'Last and then Line (Cursor) = '='
-                        then
-                           declare
-                              Dummy_Char : constant Character :=
-                                Read_Character (Line, Cursor);
-                              pragma Assert (Dummy_Char = '=');
-
-                              Dummy : Natural := Read_Natural (Line, Cursor);
-                           begin
-                              if Read_Character (Line, Cursor) /= ':' then
-                                 raise Program_Error;
-                              end if;
-                              Dummy := Read_Natural (Line, Cursor);
-                           end;
+                        Dummy : Natural := Read_Natural (Line, Cursor);
+                     begin
+                        if Read_Character (Line, Cursor) /= ':' then
+                           raise Program_Error;
                         end if;
-
-                        --  instref ([file|line])
-                        Skip_Inst_Info (Line, Cursor);
-
-                        --  typeref (various info enclosed in {}, () or <>)
-
-                        loop
-                           if Cursor > Line'Last then
-                              exit;
-                           elsif Line (Cursor) = '{' then
-                              Skip_Until (Line, Cursor, '}');
-                              Cursor := Cursor + 1;
-                           elsif Line (Cursor) = '(' then
-                              Skip_Until (Line, Cursor, ')');
-                              Cursor := Cursor + 1;
-                           elsif Line (Cursor) = '<' then
-                              Skip_Until (Line, Cursor, '>');
-                              Cursor := Cursor + 1;
-                           else
-                              exit;
-                           end if;
-                        end loop;
-
-                        declare
-                           Chunks     : constant Slice_Array :=
-                             Split (Line (Cursor .. Line'Last));
-                        begin
-                           for Chunk of Chunks loop
-                              Process_Xref (Get (Line, Chunk));
-                           end loop;
-                        end;
+                        Dummy := Read_Natural (Line, Cursor);
                      end;
                   end if;
-               end case;
-            end;
-         exception
-            when Ada.IO_Exceptions.End_Error =>
-               exit;
+
+                  --  instref ([file|line])
+                  Skip_Inst_Info (Line, Cursor);
+
+                  --  typeref (various info enclosed in {}, () or <>)
+
+                  loop
+                     if Cursor > Line'Last then
+                        exit;
+                     elsif Line (Cursor) = '{' then
+                        Skip_Until (Line, Cursor, '}');
+                        Cursor := Cursor + 1;
+                     elsif Line (Cursor) = '(' then
+                        Skip_Until (Line, Cursor, ')');
+                        Cursor := Cursor + 1;
+                     elsif Line (Cursor) = '<' then
+                        Skip_Until (Line, Cursor, '>');
+                        Cursor := Cursor + 1;
+                     else
+                        exit;
+                     end if;
+                  end loop;
+
+                  declare
+                     Chunks     : constant Slice_Array :=
+                       Split (Line (Cursor .. Line'Last));
+                  begin
+                     for Chunk of Chunks loop
+                        Process_Xref (Get (Line, Chunk));
+                     end loop;
+                  end;
+               end;
+            end if;
+         end case;
+      end Process_Line;
+
+      File   : Mapped_File := Open_Read (LI_Filename);
+      Region : Mapped_Region := Read (File);
+      Data   : constant Str_Access := GNATCOLL.Mmap.Data (Region);
+      Last   : constant Natural := GNATCOLL.Mmap.Last (Region);
+      First  : Positive := 1;
+      EOL    : Natural;
+   begin
+      --  Read the whole LI file at once and process it line by line
+
+      while First <= Last loop
+         EOL := First;
+         while EOL <= Last and then Data (EOL) /= ASCII.LF loop
+            EOL := EOL + 1;
+         end loop;
+
+         declare
+            Line_Last : Natural := EOL - 1;
+         begin
+            if Line_Last >= First and then Data (Line_Last) = ASCII.CR then
+               Line_Last := Line_Last - 1;
+            end if;
+            Process_Line (Data (First .. Line_Last));
          end;
+
+         First := EOL + 1;
       end loop;
+
+      Free (Region);
       Close (File);
    end Read_LI_Xrefs;
 
+   ------------------
+   -- Import_Xrefs --
+   ------------------
+
+   procedure Import_Xrefs
+     (Files      : in out File_Table_Type;
+      From_Files : File_Table_Type;
+      Xrefs      : Unit_Xrefs_Vectors.Vector)
+   is
+      Map : array (1 .. From_Files.Table.Last_Index) of File_Index_Type;
+      --  Mapping: index in From_Files -> index in Files
+   begin
+      for I in Map'Range loop
+         Map (I) := File_Index (Files, +From_Files.Table (I));
+      end loop;
+
+      for Unit_Xrefs of Xrefs loop
+         Unit_Xrefs.Unit := Map (Unit_Xrefs.Unit);
+         for X of Unit_Xrefs.Xrefs loop
+            X.Ref_File := Map (X.Ref_File);
+            X.Entity_File := Map (X.Entity_File);
+         end loop;
+      end loop;
+   end Import_Xrefs;
+
    ---------
    -- Put --
    ---------
@@ -3,6 +3,8 @@ with Ada.Containers.Generic_Array_Sort;
 with Ada.Containers.Vectors;
 with Ada.Environment_Variables;
 with Ada.Exceptions;
+with Ada.Strings;                     use Ada.Strings;
+with Ada.Strings.Fixed;
 with Ada.Strings.Unbounded;           use Ada.Strings.Unbounded;
 with Ada.Strings.Wide_Wide_Unbounded; use Ada.Strings.Wide_Wide_Unbounded;
 with Ada.Text_IO;
@@ -69,10 +71,33 @@ procedure Nameres is
    package Refs_Request_Vectors is new Ada.Containers.Vectors
      (Positive, Refs_Request);
 
+   type Resolution_Status is (Success, Failure, Error);
+
+   type Entry_Point_Timing is record
+      Filename : Unbounded_String;
+      Sloc     : Source_Location;
+      Image    : Unbounded_String;
+      Nodes    : Natural;
+      Status   : Resolution_Status;
+      Time     : Duration;
+   end record;
+   --  Time it took to resolve names for one xref entry point. Nodes is the
+   --  number of nodes that belong to this entry point (nested entry points
+   --  excluded), which gives an idea of the size of its logic equation.
+
+   package Timing_Vectors is new Ada.Containers.Vectors
+     (Positive, Entry_Point_Timing);
+
+   procedure Record_Timing
+     (Timings : in out Timing_Vectors.Vector; Timing : Entry_Point_Timing);
+   --  Insert Timing in Timings, which is sorted from the slowest entry point
+   --  to the fastest, and keep only the Args.Slowest.Get first elements.
+
    type Job_Data_Record is record
       Stats         : Stats_Record;
       Config        : Config_Record;
       Refs_Requests : Refs_Request_Vectors.Vector;
+      Slowest       : Timing_Vectors.Vector;
    end record;
 
    type Job_Data_Array is array (Job_ID range <>) of Job_Data_Record;
@@ -186,6 +211,14 @@ procedure Nameres is
       package Debug is new Parse_Flag
         (App.Args.Parser, "-D", "--debug",
          Help => "Debug logic equation solving");
+
+      package Slowest is new Parse_Option
+        (App.Args.Parser, Long => "--slowest",
+         Help        => "Report the N xref entry points that took the longest"
+                        & " to resolve, with a command line to trace only"
+                        & " their resolution",
+         Arg_Type    => Natural,
+         Default_Val => 0);
    end Args;
 
    package Env renames Ada.Environment_Variables;
@@ -385,6 +418,30 @@ procedure Nameres is
       end if;
    end Dump_Exception;
 
+   -------------------
+   -- Record_Timing --
+   -------------------
+
+   procedure Record_Timing
+     (Timings : in out Timing_Vectors.Vector; Timing : Entry_Point_Timing)
+   is
+      Max_Length : constant Natural := Args.Slowest.Get;
+      Position   : Positive := 1;
+   begin
+      while Position <= Natural (Timings.Length)
+            and then Timings (Position).Time >= Timing.Time
+      loop
+         Position := Position + 1;
+      end loop;
+
+      if Position <= Max_Length then
+         Timings.Insert (Position, Timing);
+         if Natural (Timings.Length) > Max_Length then
+            Timings.Delete_Last;
+         end if;
+      end if;
+   end Record_Timing;
+
    ---------------
    -- Increment --
    ---------------
@@ -994,6 +1051,9 @@ procedure Nameres is
             return False;
          end XFAIL;
 
+         procedure Record_Timing (Status : Resolution_Status);
+         --  If requested, record the time elapsed since Start for Node
+
          Verbose     : constant Boolean :=
             not (Quiet or else Args.Only_Show_Failures.Get);
          Output_JSON : constant Boolean := Args.JSON.Get;
@@ -1001,6 +1061,63 @@ procedure Nameres is
          Dummy : Visit_Status;
          Obj   : aliased J.JSON_Value;
 
+         Resolved : Boolean;
+
+         Start : Time := Clock;
+         Timed : Boolean := False;
+         --  Time at which name resolution for Node started, and whether its
+         --  duration was already recorded.
+
+         -------------------
+         -- Record_Timing --
+         -------------------
+
+         procedure Record_Timing (Status : Resolution_Status) is
+            Elapsed : constant Duration := Clock - Start;
+            Nodes   : Natural := 0;
+
+            function Count_Node (N : Ada_Node'Class) return Visit_Status;
+            --  Callback for the tree traversal in Node: count nodes that
+            --  belong to this entry point.
+
+            ----------------
+            -- Count_Node --
+            ----------------
+
+            function Count_Node (N : Ada_Node'Class) return Visit_Status is
+            begin
+               if P_Xref_Entry_Point (N) and then As_Ada_Node (N) /= Node then
+                  return Over;
+               end if;
+               Nodes := Nodes + 1;
+               return Into;
+            end Count_Node;
+
+            Dummy : Visit_Status;
+         begin
+            Timed := True;
+
+            --  Do nothing if this entry point is not slow enough to be
+            --  reported.
+
+            if Args.Slowest.Get = 0
+               or else (Natural (Job_Data.Slowest.Length) = Args.Slowest.Get
+                        and then Job_Data.Slowest.Last_Element.Time >= Elapsed)
+            then
+               return;
+            end if;
+
+            Dummy := Traverse (Node, Count_Node'Access);
+            Nameres.Record_Timing
+              (Job_Data.Slowest,
+               (Filename => +Create (+Unit.Get_Filename).Base_Name,
+                Sloc     => Start_Sloc (Sloc_Range (Node)),
+                Image    => +Node.Image,
+                Nodes    => Nodes,
+                Status   => Status,
+                Time     => Elapsed));
+         end Record_Timing;
+
       begin
          --  Pre-processing output
 
@@ -1019,7 +1136,11 @@ procedure Nameres is
 
          --  Perform name resolution
 
-         if P_Resolve_Names (Node) or else Args.Imprecise_Fallback.Get then
+         Start := Clock;
+         Resolved := P_Resolve_Names (Node);
+         Record_Timing (if Resolved then Success else Failure);
+
+         if Resolved or else Args.Imprecise_Fallback.Get then
             if not Args.Only_Show_Failures.Get then
                Dummy := Traverse (Node, Print_Node'Access);
             end if;
@@ -1052,6 +1173,9 @@ procedure Nameres is
          end if;
       exception
          when E : others =>
+            if not Timed then
+               Record_Timing (Error);
+            end if;
             Put_Line
               ("Resolution failed with exception for node " & Node.Image);
             Dump_Exception (E, Obj);
@@ -1360,6 +1484,86 @@ procedure Nameres is
          end;
       end if;
 
+      --  Report usage statistics for Libadalang's caches, aggregated from the
+      --  analysis contexts of all jobs.
+
+      if Args.Stats.Get then
+         for Kind in Cache_Kind loop
+            declare
+               Cache : Cache_Statistics :=
+                 (Entries      => 0,
+                  Hits         => 0,
+                  Misses       => 0,
+                  Memory       => 0,
+                  Compute_Time => 0.0);
+            begin
+               for Job of Jobs loop
+                  declare
+                     S : constant Cache_Statistics :=
+                        Get_Cache_Statistics (Job.Analysis_Ctx, Kind);
+                  begin
+                     Cache.Entries := Cache.Entries + S.Entries;
+                     Cache.Hits := Cache.Hits + S.Hits;
+                     Cache.Misses := Cache.Misses + S.Misses;
+                     Cache.Memory := Cache.Memory + S.Memory;
+                     Cache.Compute_Time :=
+                        Cache.Compute_Time + S.Compute_Time;
+                  end;
+               end loop;
+
+               --  Memory estimates depend on the platform and compute times
+               --  are not deterministic: print them only when asked to, so
+               --  that the default output can be used in baselines.
+
+               Put
+                 (Kind'Image & ":" & Cache.Entries'Image & " entries,"
+                  & Cache.Hits'Image & " hits," & Cache.Misses'Image
+                  & " misses");
+               if Args.Memory.Get then
+                  Put ("," & Cache.Memory'Image & " bytes");
+               end if;
+               New_Line;
+
+               if Args.Time.Get then
+                  Ada.Text_IO.Put_Line
+                    ("Time spent on " & Kind'Image & " misses: "
+                     & Cache.Compute_Time'Image);
+               end if;
+            end;
+         end loop;
+      end if;
+
+      --  Report the slowest entry points from all jobs
+
+      if Args.Slowest.Get > 0 then
+         declare
+            Slowest : Timing_Vectors.Vector;
+         begin
+            for Job of Jobs loop
+               for T of Job_Data (Job.ID).Slowest loop
+                  Record_Timing (Slowest, T);
+               end loop;
+            end loop;
+
+            Ada.Text_IO.Put_Line ("Slowest xref entry points:");
+            for T of Slowest loop
+               Ada.Text_IO.Put_Line
+                 ("  " & (+T.Filename) & ":" & Image (T.Sloc)
+                  & ": " & (+T.Image));
+               Ada.Text_IO.Put_Line
+                 ("    " & T.Time'Image & "s," & T.Nodes'Image & " nodes, "
+                  & (case T.Status is
+                     when Success => "success",
+                     when Failure => "failure",
+                     when Error   => "exception"));
+               Ada.Text_IO.Put_Line
+                 ("    trace with: --solve-line="
+                  & Ada.Strings.Fixed.Trim (T.Sloc.Line'Image, Left)
+                  & " --trace " & (+T.Filename));
+            end loop;
+         end;
+      end if;
+
       Put_Line ("Done.");
 
       if Args.Memory.Get then
@@ -0,0 +1,259 @@
+--  Report parsing costs per analysis unit, to find pathological inputs (for
+--  instance sources that trigger a lot of error recovery in the parser).
+--
+--  For each unit, this reparses the source file and reports the time it took,
+--  the size of the source, the number of tokens, nodes and parsing
+--  diagnostics, and the number of nodes created by error recovery
+--  (``ErrorDecl`` and ``ErrorStmt`` nodes).
+
+with Ada.Calendar;                  use Ada.Calendar;
+with Ada.Containers.Generic_Array_Sort;
+with Ada.Containers.Vectors;
+with Ada.Strings.Unbounded;         use Ada.Strings.Unbounded;
+with Ada.Text_IO;                   use Ada.Text_IO;
+with Ada.Unchecked_Deallocation;
+
+with GNATCOLL.Opt_Parse;
+with GNATCOLL.VFS; use GNATCOLL.VFS;
+
+with Libadalang.Analysis; use Libadalang.Analysis;
+with Libadalang.Common;   use Libadalang.Common;
+with Libadalang.Helpers;  use Libadalang.Helpers;
+
+procedure Parse_Profile is
+
+   type Unit_Profile is record
+      Filename    : Unbounded_String;
+      Parse_Time  : Duration;
+      Characters  : Natural;
+      Tokens      : Natural;
+      Nodes       : Natural;
+      Error_Nodes : Natural;
+      Diagnostics : Natural;
+   end record;
+   --  Parsing costs for one analysis unit
+
+   package Profile_Vectors is new Ada.Containers.Vectors
+     (Positive, Unit_Profile);
+
+   type Kind_Counts is array (Ada_Node_Kind_Type) of Natural;
+
+   type Job_Data_Record is record
+      Profiles : Profile_Vectors.Vector;
+
+      Error_Kinds : Kind_Counts := (others => 0);
+      --  For each node kind, number of error recovery nodes whose closest
+      --  non-list ancestor has this kind. This locates the grammar rules in
+      --  which error recovery happens.
+   end record;
+   --  Results for the units processed by one job, merged in App_Post_Process
+
+   type Job_Data_Array is array (Job_ID range <>) of Job_Data_Record;
+   type Job_Data_Array_Access is access all Job_Data_Array;
+   procedure Free is new Ada.Unchecked_Deallocation
+     (Job_Data_Array, Job_Data_Array_Access);
+
+   Job_Data : Job_Data_Array_Access;
+
+   procedure App_Setup (Context : App_Context; Jobs : App_Job_Context_Array);
+   procedure Process_Unit (Context : App_Job_Context; Unit : Analysis_Unit);
+   procedure App_Post_Process
+     (Context : App_Context; Jobs : App_Job_Context_Array);
+
+   package App is new Libadalang.Helpers.App
+     (Name               => "parse_profile",
+      Description        =>
+         "Report parsing costs per analysis unit, to find pathological inputs",
+      Enable_Parallelism => True,
+      App_Setup          => App_Setup,
+      Process_Unit       => Process_Unit,
+      App_Post_Process   => App_Post_Process);
+
+   package Args is
+      use GNATCOLL.Opt_Parse;
+
+      package Slowest is new Parse_Option
+        (App.Args.Parser, "-s", "--slowest",
+         "Only report the N units that are the slowest to parse (per"
+         & " character), 0 for all units",
+         Natural, Default_Val => 0);
+
+      package Repeat is new Parse_Option
+        (App.Args.Parser, "-r", "--repeat",
+         "Parse each unit N times and keep the fastest time, to reduce noise",
+         Positive, Default_Val => 1);
+   end Args;
+
+   function Time_Per_Char (P : Unit_Profile) return Duration
+   is (if P.Characters = 0
+       then P.Parse_Time
+       else P.Parse_Time / P.Characters);
+
+   function "<" (Left, Right : Unit_Profile) return Boolean
+   is (Time_Per_Char (Left) > Time_Per_Char (Right));
+   --  Sort units from the slowest to the fastest
+
+   procedure Put_Profile (P : Unit_Profile);
+   --  Print the parsing costs for one unit
+
+   ---------------
+   -- App_Setup --
+   ---------------
+
+   procedure App_Setup (Context : App_Context; Jobs : App_Job_Context_Array)
+   is
+      pragma Unreferenced (Context);
+   begin
+      Job_Data := new Job_Data_Array'(Jobs'Range => (others => <>));
+   end App_Setup;
+
+   ------------------
+   -- Process_Unit --
+   ------------------
+
+   procedure Process_Unit (Context : App_Job_Context; Unit : Analysis_Unit) is
+      Data    : Job_Data_Record renames Job_Data (Context.ID);
+      Charset : constant String := To_String (App.Args.Charset.Get);
+      Result  : Unit_Profile :=
+        (Filename    => To_Unbounded_String
+                          (+Create (+Unit.Get_Filename).Base_Name),
+         Parse_Time  => Duration'Last,
+         Characters  => 0,
+         Tokens      => 0,
+         Nodes       => 0,
+         Error_Nodes => 0,
+         Diagnostics => 0);
+
+      function Visit (Node : Ada_Node'Class) return Visit_Status;
+      --  Count nodes and error recovery nodes
+
+      -----------
+      -- Visit --
+      -----------
+
+      function Visit (Node : Ada_Node'Class) return Visit_Status is
+      begin
+         Result.Nodes := Result.Nodes + 1;
+         if Node.Kind in Ada_Error_Decl | Ada_Error_Stmt then
+            Result.Error_Nodes := Result.Error_Nodes + 1;
+
+            declare
+               Parent : Ada_Node := Node.Parent;
+            begin
+               while not Parent.Is_Null and then Is_List_Node (Parent.Kind)
+               loop
+                  Parent := Parent.Parent;
+               end loop;
+               if not Parent.Is_Null then
+                  Data.Error_Kinds (Parent.Kind) :=
+                     Data.Error_Kinds (Parent.Kind) + 1;
+               end if;
+            end;
+         end if;
+         return Into;
+      end Visit;
+
+   begin
+      --  Units are already parsed at this point: reparse them from their
+      --  source file to measure parsing time.
+
+      for I in 1 .. Args.Repeat.Get loop
+         declare
+            Start : constant Time := Clock;
+         begin
+            Unit.Reparse (Charset);
+            Result.Parse_Time := Duration'Min (Result.Parse_Time,
+                                               Clock - Start);
+         end;
+      end loop;
+
+      Result.Characters := Unit.Text'Length;
+      Result.Tokens := Unit.Token_Count;
+      Result.Diagnostics := Unit.Diagnostics'Length;
+      if not Unit.Root.Is_Null then
+         Unit.Root.Traverse (Visit'Access);
+      end if;
+
+      Data.Profiles.Append (Result);
+   end Process_Unit;
+
+   -----------------
+   -- Put_Profile --
+   -----------------
+
+   procedure Put_Profile (P : Unit_Profile) is
+   begin
+      Put_Line
+        (To_String (P.Filename) & ":"
+         & Natural'Image (Natural (P.Parse_Time * 1_000_000)) & " us,"
+         & P.Characters'Image & " chars,"
+         & P.Tokens'Image & " tokens,"
+         & P.Nodes'Image & " nodes,"
+         & P.Error_Nodes'Image & " error nodes,"
+         & P.Diagnostics'Image & " diagnostics");
+   end Put_Profile;
+
+   ----------------------
+   -- App_Post_Process --
+   ----------------------
+
+   procedure App_Post_Process
+     (Context : App_Context; Jobs : App_Job_Context_Array)
+   is
+      pragma Unreferenced (Context);
+
+      type Profile_Array is array (Positive range <>) of Unit_Profile;
+      procedure Sort is new Ada.Containers.Generic_Array_Sort
+        (Positive, Unit_Profile, Profile_Array);
+
+      Profiles    : Profile_Vectors.Vector;
+      Error_Kinds : Kind_Counts := (others => 0);
+   begin
+      --  Merge the results of all jobs
+
+      for Job of Jobs loop
+         declare
+            Data : Job_Data_Record renames Job_Data (Job.ID);
+         begin
+            Profiles.Append (Data.Profiles);
+            for K in Error_Kinds'Range loop
+               Error_Kinds (K) := Error_Kinds (K) + Data.Error_Kinds (K);
+            end loop;
+         end;
+      end loop;
+      Free (Job_Data);
+
+      declare
+         Sorted : Profile_Array (1 .. Natural (Profiles.Length));
+         Count  : Natural := Sorted'Length;
+      begin
+         for I in Sorted'Range loop
+            Sorted (I) := Profiles (I);
+         end loop;
+         Sort (Sorted);
+
+         if Args.Slowest.Get > 0 then
+            Count := Natural'Min (Count, Args.Slowest.Get);
+         end if;
+
+         Put_Line ("Units, from the slowest to parse (per character):");
+         for P of Sorted (1 .. Count) loop
+            Put ("  ");
+            Put_Profile (P);
+         end loop;
+      end;
+
+      if Error_Kinds /= Kind_Counts'(others => 0) then
+         New_Line;
+         Put_Line ("Error recovery nodes, by enclosing node kind:");
+         for K in Error_Kinds'Range loop
+            if Error_Kinds (K) > 0 then
+               Put_Line ("  " & K'Image & ":" & Error_Kinds (K)'Image);
+            end if;
+         end loop;
+      end if;
+   end App_Post_Process;
+
+begin
+   App.Run;
+end Parse_Profile;
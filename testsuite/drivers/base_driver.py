@@ -1,13 +1,15 @@
+import json
 import os
 import os.path
 import sys
+import zlib
 
 from e3.testsuite.control import YAMLTestControlCreator
 from e3.testsuite.driver.classic import (TestAbortWithError,
                                          TestAbortWithFailure, TestSkip)
 from e3.testsuite.driver.diff import DiffTestDriver
 
-from drivers.valgrind import Valgrind
+from drivers.valgrind import Valgrind, error_summary
 
 
 class BaseDriver(DiffTestDriver):
@@ -31,6 +33,16 @@ class BaseDriver(DiffTestDriver):
 
         # If asked to run under Valgrind, prepare a Valgrind instance
         if self.env.options.valgrind:
+            # In sharded mode, only run the testcases that belong to the
+            # current shard. Use a stable hash of the testcase name so that
+            # all machines agree on shards.
+            if self.env.valgrind_shard:
+                index, count = self.env.valgrind_shard
+                test_name = self.test_env['test_name']
+                if zlib.crc32(test_name.encode()) % count != index - 1:
+                    raise TestSkip('Not in Valgrind shard {}/{}'
+                                   .format(index, count))
+
             valgrind_supp = self.test_env.get('valgrind_suppressions', None)
             if valgrind_supp:
                 valgrind_supp = self.test_dir(valgrind_supp)
@@ -211,6 +223,16 @@ class BaseDriver(DiffTestDriver):
 
     def compute_valgrind_failures(self):
         if self.valgrind_errors:
+            # Save error summaries so that the testsuite can aggregate them
+            # across testcases (see the --valgrind-summary option).
+            filename = os.path.join(
+                self.env.valgrind_errors_dir,
+                '{}.json'.format(self.test_env['test_name'])
+            )
+            with open(filename, 'w') as f:
+                json.dump([error_summary(e, self.test_env['test_name'])
+                           for e in self.valgrind_errors], f)
+
             self.result.log += (
                 'Valgrind reported the following errors:\n{}'.format(
                     self.valgrind.format_report(self.valgrind_errors)
@@ -1,8 +1,13 @@
+import json
 import os
 import os.path
+import queue
+import subprocess
 import sys
+import tempfile
+import threading
 
-from e3.testsuite.driver.classic import TestSkip
+from e3.testsuite.driver.classic import TestAbortWithFailure, TestSkip
 
 from drivers.base_driver import BaseDriver
 
@@ -61,23 +66,62 @@ class PythonRunner(object):
         """
         Run the given Python scripts with given arguments.
         """
+        if self.use_worker:
+            return self.run_in_worker(py_file, py_args)
+
         return self.driver.run_and_check(
-            [self.interpreter, py_file] + py_args,
-            env={
-                'PYTHONPATH': self.add_paths(
-                    os.environ.get('PYTHONPATH'),
-                    self.support_dir,
-                    self.internal_support_dir
-                ),
-                'LIBADALANG_ROOTDIR': os.path.join(
-                    os.path.dirname(os.path.abspath(__file__)),
-                    '..', '..',
-                ),
-                'LIBADALANG_DISABLE_SHARED': str(
-                    int(self.driver.disable_shared)
-                )
-            }
+            [self.interpreter, py_file] + py_args, env=self.env
+        )
+
+    @property
+    def env(self):
+        """
+        Return environment variables to run Python scripts.
+        """
+        return {
+            'PYTHONPATH': self.add_paths(
+                os.environ.get('PYTHONPATH'),
+                self.support_dir,
+                self.internal_support_dir
+            ),
+            'LIBADALANG_ROOTDIR': os.path.join(
+                os.path.dirname(os.path.abspath(__file__)),
+                '..', '..',
+            ),
+            'LIBADALANG_DISABLE_SHARED': str(
+                int(self.driver.disable_shared)
+            )
+        }
+
+    @property
+    def use_worker(self):
+        """
+        Return whether to run Python scripts in long-lived interpreters (see
+        ``PythonWorkerPool``) rather than in new ones.
+        """
+        return bool(
+            self.driver.env.options.python_workers
+            and not self.driver.test_env.get('isolated', False)
+
+            # Coverage mode needs one trace file per process
+            and not self.driver.env.options.coverage
+        )
+
+    def run_in_worker(self, py_file, py_args):
+        """
+        Run the given Python script with given arguments in a long-lived
+        interpreter.
+        """
+        status, output = worker_pool.run(
+            self.interpreter, self.env, py_file, py_args,
+            self.driver.working_dir(), self.driver.default_process_timeout
         )
+        self.driver.output += output
+        if status != 0:
+            raise TestAbortWithFailure(
+                '{} returned status code {} (0 expected)'
+                .format(py_file, status))
+        return output
 
     @property
     def interpreter(self):
@@ -103,3 +147,175 @@ class PythonRunner(object):
         """
         return os.path.join(self.driver.env.root_dir, 'tests', 'internal',
                             'python_support')
+
+
+class PythonWorker(object):
+    """
+    Long-lived Python interpreter that runs scripts on request (see
+    ``python_worker.py``).
+    """
+
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                          'python_worker.py')
+
+    max_runs = 200
+    """
+    Number of scripts after which a worker is discarded, to bound the
+    consequences of memory leaks.
+    """
+
+    def __init__(self, interpreter, env):
+        subp_env = dict(os.environ)
+        subp_env.update(env)
+
+        # Send the standard error stream (which also gets what libraries
+        # write to the standard output file descriptor, see
+        # ``python_worker.py``) to a file, so that we can add what each script
+        # wrote there to its output.
+        self.stderr = tempfile.TemporaryFile()
+        self.process = subprocess.Popen(
+            [interpreter, self.script],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+            stderr=self.stderr, env=subp_env, encoding='utf-8'
+        )
+        self.runs = 0
+
+        # Read responses in a separate thread, so that ``run`` can wait for
+        # them with a timeout.
+        self.responses = queue.Queue()
+        self.reader = threading.Thread(target=self._read_responses,
+                                       daemon=True)
+        self.reader.start()
+
+    def _read_responses(self):
+        """
+        Forward all lines from the worker's standard output to the
+        ``responses`` queue. Put an empty string when reaching its end.
+        """
+        try:
+            for line in self.process.stdout:
+                self.responses.put(line)
+        except (OSError, ValueError):
+            pass
+        self.responses.put('')
+
+    def _read_stderr(self, start):
+        """
+        Return what the worker wrote on its standard error stream from the
+        ``start`` offset.
+        """
+        self.stderr.seek(start)
+        return self.stderr.read().decode('utf-8', errors='replace')
+
+    def run(self, py_file, py_args, cwd, timeout):
+        """
+        Run the given Python script with given arguments from the ``cwd``
+        directory. Return its exit status, its output, and whether the worker
+        can still be used.
+
+        If the script does not complete in ``timeout`` seconds, kill the
+        worker.
+        """
+        self.runs += 1
+        stderr_start = self.stderr.seek(0, os.SEEK_END)
+        try:
+            self.process.stdin.write(json.dumps(
+                {'script': py_file, 'args': py_args, 'cwd': cwd}
+            ))
+            self.process.stdin.write('\n')
+            self.process.stdin.flush()
+        except OSError:
+            response = ''
+        else:
+            try:
+                response = self.responses.get(timeout=timeout)
+            except queue.Empty:
+                self.process.kill()
+                response = None
+
+        if not response:
+            # The worker is dead or stuck: stop it and report what it wrote
+            # on its standard error stream, which may explain why.
+            self.process.wait()
+            output = self._read_stderr(stderr_start) + (
+                'Python worker died while running {}\n'.format(py_file)
+                if response == '' else
+                'Python worker timed out after {} seconds while running {}\n'
+                .format(timeout, py_file)
+            )
+            self.close()
+            return 1, output, False
+
+        response = json.loads(response)
+        return (response['status'],
+                response['output'] + self._read_stderr(stderr_start),
+                True)
+
+    def close(self):
+        try:
+            self.process.stdin.close()
+        except OSError:
+            pass
+        self.process.wait()
+        self.reader.join()
+        self.process.stdout.close()
+        self.stderr.close()
+
+
+class PythonWorkerPool(object):
+    """
+    Pool of long-lived Python interpreters, to avoid paying the cost of
+    starting an interpreter and of importing Libadalang for each testcase.
+
+    Workers are created on demand, so there are at most as many workers as
+    testcases running in parallel.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.idle_workers = []
+
+    def run(self, interpreter, env, py_file, py_args, cwd, timeout):
+        """
+        Run the given Python script with given arguments from the ``cwd``
+        directory in a worker that uses the ``interpreter`` Python interpreter
+        and the ``env`` environment variables. Return its exit status and its
+        output.
+
+        Workers that die or do not complete the script in ``timeout`` seconds
+        are discarded: the next scripts run in new workers.
+        """
+        key = (interpreter, tuple(sorted(env.items())))
+        worker = None
+        with self.lock:
+            for i, (k, w) in enumerate(self.idle_workers):
+                if k == key:
+                    worker = w
+                    del self.idle_workers[i]
+                    break
+        if worker is None:
+            worker = PythonWorker(interpreter, env)
+
+        status, output, reusable = worker.run(py_file, py_args, cwd, timeout)
+        if not reusable:
+            # The worker is already stopped
+            return status, output
+
+        if worker.runs >= PythonWorker.max_runs:
+            worker.close()
+        else:
+            with self.lock:
+                self.idle_workers.append((key, worker))
+        return status, output
+
+    def close(self):
+        """
+        Stop all workers.
+        """
+        with self.lock:
+            for _, worker in self.idle_workers:
+                worker.close()
+            self.idle_workers = []
+
+
+worker_pool = PythonWorkerPool()
@@ -0,0 +1,122 @@
+"""
+Long-lived Python interpreter that runs testcase scripts for
+``PythonWorkerPool`` (see ``python_driver.py``).
+
+Requests are read from the standard input and responses are written to the
+standard output, one JSON document per line. Each request describes a script
+to run::
+
+    {"script": "test.py", "args": [...], "cwd": "/path/to/working/dir"}
+
+and the corresponding response contains its exit status and everything it
+wrote on its standard output and error streams::
+
+    {"status": 0, "output": "..."}
+
+Scripts run in a fresh ``__main__`` module, so that the only state
+kept from one script to the next is the set of modules that were imported
+when the worker started (Libadalang in particular).
+"""
+
+import gc
+import io
+import json
+import os
+import sys
+import traceback
+import types
+
+
+def run_script(script, args, cwd):
+    """
+    Run the ``script`` Python file with the given command-line arguments from
+    the ``cwd`` directory, as ``python script *args`` would.
+
+    Return its exit status and its output.
+    """
+    output = io.BytesIO()
+    capture = io.TextIOWrapper(output, encoding='utf-8', errors='replace',
+                               write_through=True)
+
+    saved_stdin = sys.stdin
+    saved_argv = sys.argv
+    saved_path = list(sys.path)
+    saved_modules = set(sys.modules)
+    saved_main = sys.modules['__main__']
+    saved_cwd = os.getcwd()
+
+    path = os.path.abspath(os.path.join(cwd, script))
+    sys.argv = [script] + args
+    sys.path.insert(0, os.path.dirname(path))
+    sys.stdin = io.StringIO()
+    sys.stdout = sys.stderr = capture
+    status = 0
+    module = None
+    try:
+        os.chdir(cwd)
+        with open(path, 'rb') as f:
+            code = compile(f.read(), path, 'exec')
+        module = types.ModuleType('__main__')
+        module.__file__ = path
+        sys.modules['__main__'] = module
+        exec(code, module.__dict__)
+    except SystemExit as exc:
+        if exc.code is None:
+            status = 0
+        elif isinstance(exc.code, int):
+            status = exc.code
+        else:
+            print(exc.code, file=sys.stderr)
+            status = 1
+    except BaseException as exc:
+        # Do not show the frames for this worker, to get the same traceback as
+        # when running the script in its own interpreter.
+        tb = exc.__traceback__
+        while tb is not None and tb.tb_frame.f_code.co_filename != path:
+            tb = tb.tb_next
+        traceback.print_exception(type(exc), exc, tb)
+        status = 1
+    finally:
+        capture.flush()
+        sys.stdout = sys.__stdout__
+        sys.stderr = sys.__stderr__
+        sys.stdin = saved_stdin
+        sys.argv = saved_argv
+        sys.path[:] = saved_path
+        sys.modules['__main__'] = saved_main
+        os.chdir(saved_cwd)
+
+        # Forget about modules that the script imported (for instance helpers
+        # from the testcase directory) and destroy the analysis contexts it
+        # created, so that the next script starts from a clean state.
+        del module
+        for name in set(sys.modules) - saved_modules:
+            del sys.modules[name]
+        gc.collect()
+
+    return status, output.getvalue().decode('utf-8', errors='replace')
+
+
+def main():
+    # Keep the standard output for responses only: output written by
+    # libraries directly to the file descriptor (i.e. not through
+    # ``sys.stdout``) goes to the standard error stream instead.
+    responses = os.fdopen(os.dup(1), 'w', encoding='utf-8')
+    os.dup2(2, 1)
+
+    # Pay the cost of loading Libadalang once for all scripts
+    import libadalang
+    del libadalang
+
+    requests = sys.stdin
+    for line in requests:
+        request = json.loads(line)
+        status, output = run_script(request['script'], request['args'],
+                                    request['cwd'])
+        responses.write(json.dumps({'status': status, 'output': output}))
+        responses.write('\n')
+        responses.flush()
+
+
+if __name__ == '__main__':
+    main()
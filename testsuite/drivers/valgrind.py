@@ -1,10 +1,13 @@
+import argparse
 import collections
+import json
 import os.path
 import xml.etree.ElementTree as etree
 
 
 StackFrame = collections.namedtuple('StackFrame', 'ip obj fn dir file line')
-Error = collections.namedtuple('Error', 'message stack')
+Error = collections.namedtuple('Error', 'message stack suppression',
+                               defaults=(None, ))
 
 
 class Valgrind(object):
@@ -27,7 +30,8 @@ class Valgrind(object):
                   '--suppressions={}'.format(os.path.join(
                       self.testsuite_dir, 'valgrind-suppressions.txt',
                   )),
-                  '--leak-check=full']
+                  '--leak-check=full',
+                  '--gen-suppressions=all']
 
         if self.suppression_file:
             result.append('--suppressions={}'.format(self.suppression_file))
@@ -37,31 +41,48 @@ class Valgrind(object):
 
     def parse_report(self):
         errors = []
-        with open(self.report_file, 'r') as f:
-            xml_root = etree.parse(f).getroot()
-
-        for elt in xml_root:
-            if elt.tag == 'error':
-                what_elt = get_child(elt, 'xwhat')
-                if what_elt is None:
-                    what_elt = get_child(elt, 'what')
-                message = ('Unknown reason'
-                           if what_elt is None else
-                           get_text_in_child(what_elt, 'text'))
-                stack = []
-                for frame in get_child(elt, 'stack'):
-                    assert frame.tag == 'frame'
-                    stack.append(StackFrame(
-                        get_text_in_child(frame, 'ip'),
-                        get_text_in_child(frame, 'obj'),
-                        get_text_in_child(frame, 'fn'),
-                        get_text_in_child(frame, 'dir'),
-                        get_text_in_child(frame, 'file'),
-                        get_text_in_child(frame, 'line'),
-                    ))
-                errors.append(Error(message, tuple(stack)))
+
+        # Reports can be huge for big testcases: process errors as soon as
+        # they are parsed and then discard them rather than loading the whole
+        # XML tree in memory.
+        with open(self.report_file, 'rb') as f:
+            events = etree.iterparse(f, events=('start', 'end'))
+            _, xml_root = next(events)
+            for event, elt in events:
+                if event == 'end' and elt.tag == 'error':
+                    errors.append(self.parse_error(elt))
+                    xml_root.clear()
         return errors
 
+    @staticmethod
+    def parse_error(elt):
+        """
+        Turn an "error" XML element from a Valgrind report into an ``Error``
+        instance.
+        """
+        what_elt = get_child(elt, 'xwhat')
+        if what_elt is None:
+            what_elt = get_child(elt, 'what')
+        message = ('Unknown reason'
+                   if what_elt is None else
+                   get_text_in_child(what_elt, 'text'))
+        stack = []
+        for frame in get_child(elt, 'stack'):
+            assert frame.tag == 'frame'
+            stack.append(StackFrame(
+                get_text_in_child(frame, 'ip'),
+                get_text_in_child(frame, 'obj'),
+                get_text_in_child(frame, 'fn'),
+                get_text_in_child(frame, 'dir'),
+                get_text_in_child(frame, 'file'),
+                get_text_in_child(frame, 'line'),
+            ))
+        suppression_elt = get_child(elt, 'suppression')
+        suppression = (None
+                       if suppression_elt is None else
+                       get_text_in_child(suppression_elt, 'rawtext'))
+        return Error(message, tuple(stack), suppression)
+
     @classmethod
     def format_report(cls, errors):
         result = []
@@ -89,6 +110,60 @@ def format_stack_frame(frame):
     return ''.join(result)
 
 
+def error_summary(error, test_name):
+    """
+    Return a JSON-serializable summary for an ``Error`` instance that was
+    reported for the given testcase.
+    """
+    return {
+        'message': error.message,
+        'stack': [format_stack_frame(frame) for frame in error.stack],
+        'suppression': error.suppression,
+        'tests': [test_name],
+    }
+
+
+def merge_summaries(summaries):
+    """
+    Merge the given error summaries (see ``error_summary``): errors that have
+    the same suppression candidate (or the same message and stack if there
+    is no suppression candidate) are merged into a single summary that lists
+    all testcases for which they were reported.
+
+    Return the merged summaries, sorted so that errors that are reported for
+    the most testcases come first.
+    """
+    result = {}
+    for summary in summaries:
+        key = summary['suppression'] or '\n'.join(
+            [summary['message']] + summary['stack']
+        )
+        try:
+            merged = result[key]
+        except KeyError:
+            merged = result[key] = dict(summary, tests=[])
+        merged['tests'] = sorted(set(merged['tests']) | set(summary['tests']))
+
+    return sorted(result.values(),
+                  key=lambda s: (-len(s['tests']), s['message'] or ''))
+
+
+def read_summaries(filename):
+    """
+    Return the error summaries that the given JSON file contains.
+    """
+    with open(filename) as f:
+        return json.load(f)
+
+
+def write_summaries(filename, summaries):
+    """
+    Write the given error summaries to a JSON file.
+    """
+    with open(filename, 'w') as f:
+        json.dump(summaries, f, indent=2)
+
+
 def get_child(node, tag):
     """
     Return the first child in `node` that has the given tag, or None if there
@@ -107,3 +182,39 @@ def get_text_in_child(node, tag):
     """
     child = get_child(node, tag)
     return None if child is None else child.text
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Merge Valgrind error summaries, for instance the ones'
+                    ' that sharded runs of the testsuite produce with'
+                    ' --valgrind-summary.'
+    )
+    parser.add_argument('summaries', nargs='+',
+                        help='JSON files that contain error summaries.')
+    parser.add_argument('--output', '-o',
+                        help='Write the merged summaries to this file.')
+    parser.add_argument('--suppressions', '-s',
+                        help='Write suppression candidates for all errors to'
+                             ' this file.')
+    args = parser.parse_args()
+
+    summaries = merge_summaries(
+        summary
+        for filename in args.summaries
+        for summary in read_summaries(filename)
+    )
+    if args.output:
+        write_summaries(args.output, summaries)
+    if args.suppressions:
+        with open(args.suppressions, 'w') as f:
+            for summary in summaries:
+                if summary['suppression']:
+                    f.write(summary['suppression'].strip())
+                    f.write('\n')
+
+    for summary in summaries:
+        print('{} ({} testcases)'.format(summary['message'],
+                                         len(summary['tests'])))
+        for frame in summary['stack']:
+            print('  {}'.format(frame))
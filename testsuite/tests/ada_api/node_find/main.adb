@@ -71,7 +71,7 @@ begin
                                        or Kind_Is (Ada_Component_Decl)));
 
    declare
-      Foo_Type : constant Type_Decl := Find_First
+      Foo_Type  : constant Type_Decl := Find_First
         (Ctx.Get_From_File ("pkg.ads").Root,
          Kind_Is (Ada_Type_Decl)).As_Type_Decl;
    begin
@@ -79,5 +79,25 @@ begin
                 Xref_Is (Foo_Type.F_Name));
    end;
 
+   --  Xref_Is skips name resolution for identifiers whose symbol differs from
+   --  the target name: check that identifiers with the same symbol (whatever
+   --  their casing) still match, and that those which designate another
+   --  declaration with the same name do not.
+
+   declare
+      Xref_Unit : constant Analysis_Unit :=
+        Ctx.Get_From_File ("xref_is.ads");
+      Foo_Type  : constant Type_Decl := Find_First
+        (Xref_Unit.Root, Kind_Is (Ada_Type_Decl)).As_Type_Decl;
+      Foo_Obj   : constant Basic_Decl := Find_First
+        (Xref_Unit.Root,
+         Decl_Defines ("Foo") and Kind_Is (Ada_Object_Decl)).As_Basic_Decl;
+   begin
+      Run_Find ("xref_is.ads", "All references to the Foo type",
+                Xref_Is (Foo_Type.F_Name));
+      Run_Find ("xref_is.ads", "All references to the Nested.Foo object",
+                Xref_Is (Foo_Obj.P_Defining_Name));
+   end;
+
    Put_Line ("Done.");
 end Main;
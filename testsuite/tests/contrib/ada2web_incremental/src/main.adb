@@ -0,0 +1,6 @@
+with Mid;
+
+procedure Main is
+begin
+   Mid.Run;
+end Main;
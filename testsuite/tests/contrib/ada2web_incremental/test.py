@@ -0,0 +1,58 @@
+"""
+Check that ada2web --incremental regenerates a document when a unit it
+depends on changes, even when this unit is outside the processed projects and
+is not a direct dependency.
+"""
+
+import glob
+import os.path
+import subprocess
+
+from utils import gprbuild, in_contrib
+
+
+gprbuild(in_contrib('highlight', 'highlight.gpr'))
+
+
+def run(label):
+    """
+    Run ada2web incrementally on the P project and print whether it generated
+    the document for main.adb again.
+    """
+    subprocess.check_call([in_contrib('highlight', 'bin', 'ada2web'),
+                           '-Pp.gpr', '--incremental', 'p'])
+    document, = glob.glob(os.path.join('obj', 'ada2web', '*',
+                                       'main.adb.html'))
+    with open(document) as f:
+        regenerated = f.read() != 'old document'
+    print('{}: main.adb.html regenerated: {}'.format(label, regenerated))
+
+    # Replace the document so that the next run shows whether it writes it
+    # again.
+    with open(document, 'w') as f:
+        f.write('old document')
+
+    return document
+
+
+document = run('First run')
+
+# The stamp lists the source file and all the units it depends on, directly or
+# not, including those outside the processed projects.
+with open(document + '.stamp') as f:
+    lines = f.read().splitlines()
+print('Stamp dependencies: {}'.format(
+    ', '.join(sorted(os.path.basename(l.split(' ', 1)[1]) for l in lines[1:]))
+))
+
+run('No change')
+
+# Leaf is withed by Mid only, and belongs to the Dep project, which ada2web
+# does not process: editing it must still regenerate the document for Main.
+with open(os.path.join('dep', 'leaf.ads'), 'w') as f:
+    f.write('package Leaf is\n   procedure Run (X : Integer := 0);\nend Leaf;\n')
+run('Leaf edited')
+
+run('No change after the edit')
+
+print('Done.')
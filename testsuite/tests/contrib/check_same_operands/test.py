@@ -1,4 +1,6 @@
+import shutil
 import sys
+import tempfile
 
 from utils import in_contrib
 
@@ -9,3 +11,12 @@ import check_same_operands
 
 check_same_operands.main(check_same_operands.parser.parse_args(
     ['foo.adb']))
+
+# With a parse cache, the second run reuses the output of the first one
+cache_dir = tempfile.mkdtemp()
+try:
+    for _ in range(2):
+        check_same_operands.main(check_same_operands.parser.parse_args(
+            ['--parse-cache', cache_dir, 'foo.adb']))
+finally:
+    shutil.rmtree(cache_dir)
@@ -0,0 +1,8 @@
+with Pkg;
+
+procedure Main is
+   V : Pkg.T;
+begin
+   Pkg.X := Pkg.X + 1;
+   Pkg.Prim (V);
+end Main;
@@ -0,0 +1,74 @@
+import json
+import os.path
+import subprocess
+
+from utils import gprbuild, in_contrib
+
+
+gprbuild(in_contrib('lal_server', 'lal_server.gpr'))
+
+requests = [
+    # Name resolution requests
+    {'id': 1, 'method': 'referenced_decl',
+     'params': {'file': 'main.adb', 'line': 6, 'column': 8}},
+    {'id': 2, 'method': 'references',
+     'params': {'file': 'pkg.ads', 'line': 4, 'column': 4}},
+    {'id': 3, 'method': 'primitives',
+     'params': {'file': 'main.adb', 'line': 4, 'column': 12}},
+    {'id': 4, 'method': 'complete',
+     'params': {'file': 'main.adb', 'line': 7, 'column': 4}},
+
+    # Edits: introduce a syntax error, then reload the file
+    {'id': 5, 'method': 'diagnostics', 'params': {'file': 'main.adb'}},
+    {'id': 6, 'method': 'did_change',
+     'params': {'file': 'main.adb', 'text': 'procedure Main is\nbegin\n'}},
+    {'id': 7, 'method': 'diagnostics', 'params': {'file': 'main.adb'}},
+    {'id': 8, 'method': 'did_change', 'params': {'file': 'main.adb'}},
+    {'id': 9, 'method': 'references',
+     'params': {'file': 'pkg.ads', 'line': 4, 'column': 4}},
+
+    # Invalid requests
+    {'id': 10, 'method': 'foo'},
+    {'id': 11, 'method': 'diagnostics'},
+    [1],
+    'not JSON',
+
+    {'id': 12, 'method': 'shutdown'},
+
+    # Requests after "shutdown" are ignored
+    {'id': 13, 'method': 'diagnostics', 'params': {'file': 'main.adb'}},
+]
+
+
+def normalize(value):
+    """
+    Strip directories from filenames in responses.
+    """
+    if isinstance(value, dict):
+        return {k: (os.path.basename(v) if k == 'file' else normalize(v))
+                for k, v in value.items()}
+    elif isinstance(value, list):
+        return [normalize(v) for v in value]
+    else:
+        return value
+
+
+p = subprocess.run(
+    [in_contrib('lal_server', 'bin', 'lal_server'),
+     '--max-completions=1', 'main.adb', 'pkg.ads'],
+    input=''.join((r if isinstance(r, str) else json.dumps(r)) + '\n'
+                  for r in requests),
+    stdout=subprocess.PIPE, encoding='utf-8', check=True
+)
+for line in p.stdout.splitlines():
+    response = normalize(json.loads(line))
+
+    # Completion items depend on the runtime and diagnostics depend on error
+    # recovery: only show whether there are any.
+    if response.get('id') in (4, 7):
+        response['result'] = bool(response['result'])
+    elif response.get('error', '').startswith('invalid JSON'):
+        response['error'] = 'invalid JSON'
+
+    print(json.dumps(response, sort_keys=True))
+print('Done.')
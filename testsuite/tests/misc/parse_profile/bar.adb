@@ -0,0 +1,4 @@
+procedure Bar is
+begin
+   null;
+end Bar;
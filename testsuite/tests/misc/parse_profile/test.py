@@ -0,0 +1,47 @@
+"""
+Run the parse_profile program with several jobs and check that its report
+covers all units with the same counts as the Python API.
+"""
+
+import re
+import subprocess
+
+import libadalang as lal
+
+
+unit_re = re.compile(
+    r'  (?P<filename>\S+): \d+ us,'
+    r' (?P<characters>\d+) chars,'
+    r' (?P<tokens>\d+) tokens,'
+    r' (?P<nodes>\d+) nodes,'
+    r' (?P<error_nodes>\d+) error nodes,'
+    r' (?P<diagnostics>\d+) diagnostics$'
+)
+
+filenames = ['foo.adb', 'bar.adb']
+output = subprocess.check_output(['parse_profile', '-j2'] + filenames,
+                                 encoding='utf-8')
+lines = output.splitlines()
+
+# Units are sorted by parsing time, which is not deterministic: sort them by
+# file name.
+print(lines.pop(0))
+units = []
+while lines and lines[0]:
+    m = unit_re.match(lines.pop(0))
+    assert m, output
+    units.append(m.groupdict())
+
+ctx = lal.AnalysisContext()
+for unit in sorted(units, key=lambda u: u['filename']):
+    profile = ctx.profile_parse(unit['filename'])
+    assert int(unit['characters']) == profile.characters
+    assert int(unit['tokens']) == profile.tokens
+    assert int(unit['nodes']) == profile.nodes
+    assert int(unit['error_nodes']) == sum(profile.error_nodes.values())
+    assert int(unit['diagnostics']) == profile.diagnostics
+    print('  {}: same counts as the Python API'.format(unit['filename']))
+
+# Error recovery nodes from all jobs are merged
+for line in lines:
+    print(line)
@@ -0,0 +1,12 @@
+procedure Test is
+   X : Integer := 0;
+begin
+   X := X + 1;
+   pragma Test_Statement;
+
+   X := (X + 1) * (X - 2);
+   pragma Test_Statement;
+
+   X := 3;
+   pragma Test_Statement;
+end Test;
@@ -0,0 +1,78 @@
+"""
+Run nameres with the --slowest option and check the format and the ordering
+of its report.
+"""
+
+import re
+import subprocess
+
+import libadalang as lal
+
+
+header = 'Slowest xref entry points:'
+node_re = re.compile(r'  (?P<filename>\S+):(?P<sloc>\d+:\d+): (?P<image>.*)$')
+timing_re = re.compile(
+    r'    (?P<time>\d+\.\d+)s, (?P<nodes>\d+) nodes, (?P<status>\w+)$'
+)
+trace_re = re.compile(r'    trace with: (?P<options>.*)$')
+
+
+def run(slowest):
+    """
+    Run nameres on test.adb, reporting the given number of slowest entry
+    points, and return the list of entries in its report.
+    """
+    output = subprocess.check_output(
+        ['nameres', '--quiet', '--slowest={}'.format(slowest), 'test.adb'],
+        encoding='utf-8'
+    )
+    lines = output.splitlines()
+    assert header in lines, output
+    lines = lines[lines.index(header) + 1:]
+
+    entries = []
+    while lines and lines[0].startswith('  '):
+        matches = [regexp.match(lines.pop(0))
+                   for regexp in (node_re, timing_re, trace_re)]
+        assert all(matches), output
+        entry = {}
+        for m in matches:
+            entry.update(m.groupdict())
+        entries.append(entry)
+
+    # Entry points must come from the slowest to the fastest
+    times = [float(e['time']) for e in entries]
+    assert times == sorted(times, reverse=True), output
+
+    return entries
+
+
+def count_nodes(node):
+    """
+    Return the number of nodes in the subtree rooted at ``node``.
+    """
+    return 1 + sum(count_nodes(c) for c in node if c is not None)
+
+
+ctx = lal.AnalysisContext()
+unit = ctx.get_from_file('test.adb')
+
+# All three entry points are reported. Times are not deterministic, so sort
+# entries by source location before printing them.
+print(header)
+for e in sorted(run(3), key=lambda e: [int(n) for n in e['sloc'].split(':')]):
+    line = int(e['sloc'].split(':')[0])
+    stmt = unit.root.find(
+        lambda n: n.is_a(lal.AssignStmt) and n.sloc_range.start.line == line
+    )
+    assert int(e['nodes']) == count_nodes(stmt)
+
+    print('  {}:{}: {}'.format(e['filename'], e['sloc'], e['image']))
+    print('    {} nodes, {}'.format(e['nodes'], e['status']))
+    print('    trace with: {}'.format(e['options']))
+
+# Only the slowest entry points are kept
+print('')
+print('With --slowest=2: {} entries'.format(len(run(2))))
+
+print('Done.')
@@ -0,0 +1,20 @@
+procedure Test is
+   package P is
+      type T is tagged null record;
+
+      function "=" (L, R : T) return Boolean is (True);
+      procedure G (X : T) is null;
+      procedure H (X : T) is null;
+      procedure H (X : T; Y : Integer) is null;
+   end P;
+
+   package Q is
+      type U is new P.T with null record;
+
+      procedure G_Impl (X : U) is null;
+      overriding procedure G (X : U) renames G_Impl;
+      overriding procedure H (X : U; Y : Integer) is null;
+   end Q;
+begin
+   null;
+end Test;
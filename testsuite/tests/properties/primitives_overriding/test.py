@@ -0,0 +1,34 @@
+"""
+Check that get_primitives keeps only the most overriding primitives for
+operators, renamings and overloads with different numbers of parameters.
+"""
+
+import libadalang as lal
+
+
+ctx = lal.AnalysisContext()
+u = ctx.get_from_file("test.adb")
+
+assert not u.diagnostics
+
+
+def sorted_prims(prims):
+    return sorted(prims, key=lambda p: (p.sloc_range.start.line,
+                                        p.sloc_range.start.column))
+
+
+for tpe in u.root.findall(lal.TypeDecl):
+    prims = tpe.p_get_primitives()
+    print("Primitives of {}:".format(tpe.p_defining_name.text))
+    for p in sorted_prims(prims):
+        print("  {} {} at line {}".format(
+            p.kind_name, p.p_defining_name.text, p.sloc_range.start.line
+        ))
+
+    # Predefined operators must not hide user-defined primitives
+    with_predefined = tpe.p_get_primitives(include_predefined_operators=True)
+    assert sorted_prims(
+        p for p in with_predefined if not p.is_a(lal.SyntheticSubpDecl)
+    ) == sorted_prims(prims)
+
+print('Done')
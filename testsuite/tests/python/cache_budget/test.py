@@ -0,0 +1,51 @@
+import libadalang as lal
+
+
+foo_buffer = b"""
+procedure Foo is
+   X : Integer := 1;
+begin
+   X := X + 1;
+end Foo;
+"""
+
+bar_buffer = b"""
+procedure Bar is
+   Y : Integer := 1;
+begin
+   Y := Y * 2;
+end Bar;
+"""
+
+
+def run(ctx):
+    foo = ctx.get_from_buffer('foo.adb', foo_buffer)
+    bar = ctx.get_from_buffer('bar.adb', bar_buffer)
+    foo_stmt = foo.root.find(lal.AssignStmt)
+    bar_stmt = bar.root.find(lal.AssignStmt)
+
+    foo_stmt.p_resolve_names
+    bar_stmt.p_resolve_names
+    entries = ctx.cache_statistics()['name_resolution'].entries
+
+    # Names in Foo can still be resolved after its cache was cleared
+    print('  Foo: {}'.format(foo_stmt.f_dest.p_referenced_decl()))
+    return entries
+
+
+print('Unbounded context:')
+unbounded = run(lal.AnalysisContext())
+
+print('Bounded context:')
+bounded = run(lal.AnalysisContext(cache_budget=1))
+
+print('Less cache entries with a budget: {}'.format(bounded < unbounded))
+
+ctx = lal.AnalysisContext()
+ctx.set_cache_budget(0)
+try:
+    ctx.set_cache_budget(-1)
+except ValueError as exc:
+    print('ValueError: {}'.format(exc))
+
+print('Done.')
@@ -0,0 +1,53 @@
+import libadalang as lal
+
+
+src_buffer = b"""
+procedure Foo is
+   N : constant := 4;
+   M : constant Integer := N * 2;
+   X : Integer := M;
+begin
+   X := X + M;
+end Foo;
+"""
+
+ctx = lal.AnalysisContext()
+unit = ctx.get_from_buffer('foo.adb', src_buffer)
+
+
+def stats():
+    return ctx.cache_statistics()
+
+
+print('Caches: {}'.format(sorted(stats())))
+before = stats()
+
+# Resolving names in a statement is a cache miss, then queries on names in
+# the same statement reuse the cached resolution.
+stmt = unit.root.find(lal.AssignStmt)
+stmt.p_resolve_names
+middle = stats()
+print('Referenced decl: {}'.format(stmt.f_dest.p_referenced_decl()))
+after = stats()
+
+nameres = [s['name_resolution'] for s in (before, middle, after)]
+print('Name resolution: misses increased: {}, then hits increased: {}'
+      .format(nameres[1].misses > nameres[0].misses,
+              nameres[2].hits > nameres[1].hits
+              and nameres[2].misses == nameres[1].misses))
+print('Entries and memory: {}'.format(
+    nameres[2].entries > 0 and nameres[2].memory > 0
+))
+
+# Evaluating M twice evaluates its declaration (and N's) only once
+m_ref = stmt.f_expr.f_right
+before = stats()['static_evaluation']
+print('First evaluation: {}'.format(m_ref.p_eval_as_int))
+middle = stats()['static_evaluation']
+print('Second evaluation: {}'.format(m_ref.p_eval_as_int))
+after = stats()['static_evaluation']
+print('Static evaluation: misses {}, hits {}'.format(
+    middle.misses - before.misses, after.hits - middle.hits
+))
+
+print('Done.')
@@ -0,0 +1,46 @@
+import libadalang as lal
+
+
+src_buffer = b"""
+package Foo is
+   N : constant := 4;
+   M : constant Integer := N * 2;
+   V : Integer;
+
+   type A1 is array (1 .. N) of Integer;
+   type A2 is array (N .. M) of Integer;
+   type A3 is array (1 .. V) of Integer;
+end Foo;
+"""
+
+ctx = lal.AnalysisContext()
+unit = ctx.get_from_buffer('foo.ads', src_buffer)
+
+exprs = [bo for r in unit.root.findall(lal.BinOp)
+         if r.f_op.kind_name == 'OpDoubleDot'
+         for bo in (r.f_left, r.f_right)]
+print('Bounds: {}'.format([e.text for e in exprs]))
+print('Values: {}'.format(lal.Expr.eval_as_int_batch(exprs)))
+
+# The batch call must agree with p_eval_as_int, even when it hits cached
+# evaluations of constants.
+for e in exprs:
+    try:
+        value = e.p_eval_as_int
+    except lal.PropertyError:
+        value = None
+    assert value == lal.Expr.eval_as_int_batch([e])[0]
+
+# Evaluations are invalidated when the unit is reparsed
+unit.reparse(src_buffer.replace(b':= 4', b':= 5'))
+exprs = [bo for r in unit.root.findall(lal.BinOp)
+         if r.f_op.kind_name == 'OpDoubleDot'
+         for bo in (r.f_left, r.f_right)]
+print('After reparse: {}'.format(lal.Expr.eval_as_int_batch(exprs)))
+
+try:
+    lal.Expr.eval_as_int_batch([unit.root])
+except TypeError as exc:
+    print('TypeError: {}'.format(exc))
+
+print('Done.')
@@ -0,0 +1,89 @@
+import libadalang as lal
+
+
+src_buffer = b"""
+procedure Foo is
+   X : Integer := 1;
+begin
+   X := X + 1;
+   if X > 2 then
+      X := 0;
+   end if;
+end Foo;
+"""
+
+
+def reference(node, types, max_depth=None, prune=(), depth=0):
+    """
+    Node-by-node implementation of find_descendants, for comparison.
+    """
+    result = []
+    if max_depth is not None and depth >= max_depth:
+        return result
+    for child in node:
+        if child is None:
+            continue
+        if isinstance(child, types):
+            result.append(child)
+        if not isinstance(child, prune):
+            result.extend(reference(child, types, max_depth, prune, depth + 1))
+    return result
+
+
+ctx = lal.AnalysisContext()
+unit = ctx.get_from_buffer('foo.adb', src_buffer)
+root = unit.root
+
+print('Identifiers: {}'.format(
+    [n.text for n in root.find_descendants(lal.Identifier)]
+))
+print('Identifiers outside declarative parts: {}'.format(
+    [n.text for n in root.find_descendants(lal.Identifier,
+                                           prune=lal.DeclarativePart)]
+))
+print('Statements: {}'.format(
+    [n.kind_name for n in root.find_descendants([lal.AssignStmt,
+                                                 lal.IfStmt])]
+))
+print('')
+
+# finditer fetches results in batches of growing size: lookups for all nodes
+# and for nested nodes (expressions) check that resuming the traversal after
+# the last node of a batch does not skip or repeat nodes.
+for types in (lal.Identifier, lal.Expr, (lal.BinOp, lal.IfStmt),
+              lal.AdaNode):
+    for max_depth in (None, 1, 5):
+        for prune in ((), lal.Stmt, (lal.DeclarativePart, lal.BinOp)):
+            expected = reference(root, types, max_depth, prune)
+            assert root.find_descendants(types, max_depth, prune) == expected
+
+    # The generic node lookup methods use the same native traversal
+    expected = reference(root, types)
+    assert root.findall(types) == expected
+    assert list(root.finditer(types)) == expected
+    assert root.find(types) == expected[0]
+
+print('Native traversals match the reference implementation')
+
+# Predicates and keyword filters still work
+print('Find with predicate: {}'.format(
+    root.find(lambda n: n.text == '0')
+))
+print('Find with filter: {}'.format(
+    root.find(lal.Identifier, text='Integer')
+))
+print('Find all with filter and several types: {}'.format(
+    root.findall((lal.Identifier, lal.IntLiteral), text='X')
+))
+
+# finditer stays lazy: it returns an iterator, not a precomputed list
+it = root.finditer(lal.Identifier)
+assert not isinstance(it, list)
+print('First identifier: {}'.format(next(it)))
+
+try:
+    root.find_descendants(lambda n: True)
+except TypeError as exc:
+    print('TypeError: {}'.format(exc))
+
+print('Done.')
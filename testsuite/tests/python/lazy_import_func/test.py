@@ -0,0 +1,24 @@
+import libadalang as lal
+
+
+# C API functions used by Python-only extensions are imported on first use
+func = lal._c_expr_eval_as_int_batch
+print('After import: {}'.format(func.is_imported))
+
+# None of them is imported when loading the module
+eager = sorted(name for name, value in vars(lal).items()
+               if isinstance(value, lal._LazyFunc) and value.is_imported)
+print('Imported at load time: {}'.format(eager))
+
+ctx = lal.AnalysisContext()
+u = ctx.get_from_buffer('foo.ads', b"""
+package Foo is
+   A : constant := 1 + 2;
+end Foo;
+""")
+expr = u.root.find(lal.BinOp)
+print('Evaluation: {}'.format(lal.Expr.eval_as_int_batch([expr])))
+print('After first call: {}'.format(func.is_imported))
+print('Evaluation: {}'.format(lal.Expr.eval_as_int_batch([expr])))
+
+print('Done.')
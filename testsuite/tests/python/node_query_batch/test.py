@@ -0,0 +1,49 @@
+import libadalang as lal
+
+
+src_buffer = b"""
+package Foo is
+   type T is range 1 .. 10;
+   X : T := 1;
+   Y : T := X;
+   Z : T := Undefined;
+end Foo;
+"""
+
+ctx = lal.AnalysisContext()
+unit = ctx.get_from_buffer('foo.ads', src_buffer)
+
+x, y, z = unit.root.findall(lal.ObjectDecl)
+nodes = [
+    y.f_default_expr,
+    y.f_type_expr.f_name,
+    x.f_default_expr,
+    x.f_ids[0],
+    z.f_default_expr,
+]
+
+results = lal.AdaNode.query_batch(nodes, fully_qualified_name=True)
+for n, decl, name, error in zip(nodes, results.referenced_decls,
+                                results.fully_qualified_names,
+                                results.errors):
+    print('{}:'.format(n))
+    print('  referenced decl: {}'.format(decl))
+    print('  fully qualified name: {}'.format(name))
+    print('  has error: {}'.format(error is not None))
+print('Expression types: {}'.format(results.expression_types))
+
+# The batch call must agree with p_referenced_decl
+for n, decl in zip(nodes[:2], results.referenced_decls):
+    assert n.p_referenced_decl() == decl
+
+results = lal.AdaNode.query_batch(nodes[:1], referenced_decl=False,
+                                  expression_type=True)
+print('Referenced decls: {}'.format(results.referenced_decls))
+print('Expression types: {}'.format(results.expression_types))
+
+try:
+    lal.AdaNode.query_batch([unit])
+except TypeError as exc:
+    print('TypeError: {}'.format(exc))
+
+print('Done.')
@@ -0,0 +1,106 @@
+import os
+import shutil
+import tempfile
+
+import libadalang as lal
+
+
+src_buffer = b"""--  Comment
+procedure Foo is
+begin
+   null;
+end Foo;
+"""
+
+cache_dir = tempfile.mkdtemp()
+
+
+def columns(export):
+    return {name: list(getattr(export, name)) for name in export.columns}
+
+
+def check(cache, label):
+    entry = cache.get_from_buffer('foo.adb', src_buffer)
+    print('{}: hits={}, misses={}'.format(label, cache.hits, cache.misses))
+    return entry
+
+
+try:
+    # The first lookup parses the buffer, the second one uses the cache
+    cache = lal.ParseCache(cache_dir)
+    fresh = check(cache, 'First lookup')
+    cached = check(cache, 'Second lookup')
+
+    # The cache is persistent: a new cache instance uses previous entries
+    cache = lal.ParseCache(cache_dir)
+    cached = check(cache, 'New cache instance')
+
+    # Changing the content or the settings leads to different entries
+    cache.get_from_buffer('foo.adb', src_buffer.replace(b'Foo', b'Bar'))
+    print('Modified buffer: hits={}, misses={}'.format(cache.hits,
+                                                       cache.misses))
+    cache = lal.ParseCache(cache_dir, with_trivia=False)
+    check(cache, 'Without trivia')
+
+    # Cached exports must contain the same data as fresh ones
+    assert columns(cached.tree) == columns(fresh.tree)
+    assert columns(cached.tokens) == columns(fresh.tokens)
+    assert [cached.tokens.text(i) for i in range(len(cached.tokens))] == [
+        fresh.tokens.text(i) for i in range(len(fresh.tokens))
+    ]
+    assert cached.tree.node_type(0) is lal.CompilationUnit
+    print('Cached data matches fresh data')
+
+    try:
+        cached.tree.node(0)
+    except ValueError as exc:
+        print('ValueError: {}'.format(exc))
+
+    # Corrupted entries are parsed again
+    cache = lal.ParseCache(cache_dir)
+    with open(cache._entry_path(src_buffer), 'wb') as f:
+        f.write(b'{"tree_length": 1}\n')
+    check(cache, 'Corrupted entry')
+    check(cache, 'Repaired entry')
+
+    # The cache is keyed by the actual library file, not by its soname
+    assert os.path.isfile(lal._library_path())
+
+    # Outputs of syntactic tools are also cached
+    def count_stmts(filename):
+        unit = lal.AnalysisContext().get_from_file(filename)
+        print('{}: {} statements'.format(
+            filename, len(unit.root.findall(lal.Stmt))
+        ))
+
+    with open('foo.adb', 'wb') as f:
+        f.write(src_buffer)
+    cache = lal.ParseCache(cache_dir)
+    for label in ('First run', 'Second run'):
+        cache.run_tool('foo.adb', 'count_stmts', count_stmts)
+        print('{}: hits={}, misses={}'.format(label, cache.hits,
+                                              cache.misses))
+
+    # Changing the code of a tool invalidates its cached outputs
+    def load_tool(message):
+        with open('tool.py', 'w') as f:
+            f.write('def tool(filename):\n'
+                    '    print({!r}.format(filename))\n'.format(message))
+        namespace = {}
+        with open('tool.py') as f:
+            exec(compile(f.read(), os.path.abspath('tool.py'), 'exec'),
+                 namespace)
+        return namespace['tool']
+
+    cache = lal.ParseCache(cache_dir)
+    for label, message in [('Tool v1', '{}: v1'),
+                           ('Tool v1 again', '{}: v1'),
+                           ('Tool v2', '{}: v2')]:
+        cache.run_tool('foo.adb', 'tool', load_tool(message))
+        print('{}: hits={}, misses={}'.format(label, cache.hits,
+                                              cache.misses))
+
+finally:
+    shutil.rmtree(cache_dir)
+
+print('Done.')
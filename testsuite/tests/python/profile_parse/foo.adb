@@ -0,0 +1,6 @@
+procedure Foo is
+   X : Integer := 1;
+   X := 2;
+begin
+   null;
+end Foo;
@@ -0,0 +1,19 @@
+import libadalang as lal
+
+
+ctx = lal.AnalysisContext()
+profile = ctx.profile_parse('foo.adb', repeat=3)
+
+with open('foo.adb') as f:
+    source = f.read()
+
+print('Unit: {}'.format(profile.unit))
+print('Characters: {}'.format(profile.characters == len(source)))
+print('Tokens: {}'.format(profile.tokens == profile.unit.token_count))
+print('Nodes: {}'.format(profile.nodes == len(profile.unit.export_tree())))
+print('Diagnostics: {}'.format(profile.diagnostics > 0))
+print('Error recovery in: {}'.format(sorted(profile.error_nodes)))
+print('Positive times: {}'.format(
+    profile.parse_time > 0 and profile.time_per_character > 0
+))
+print('Done.')
@@ -0,0 +1,66 @@
+import libadalang as lal
+
+
+ctx = lal.AnalysisContext()
+u = ctx.get_from_buffer('foo.ads', b"""package Foo is
+   X : Integer := 1;
+end Foo;
+""")
+
+
+def edit(start, end, text):
+    print('Edit {}-{} with {}: {}'.format(
+        start, end, repr(text), u.apply_edit(start, end, text)
+    ))
+    for decl in u.root.findall(lal.ObjectDecl):
+        print('  {}'.format(decl))
+
+
+# Rename X into Y
+edit(18, 19, 'Y')
+
+# Edits that do not change the source buffer do not reparse the unit: nodes
+# from before the edit are still valid.
+decl = u.root.find(lal.ObjectDecl)
+edit(18, 19, 'Y')
+print('Still valid: {}'.format(decl))
+
+# Insert a declaration before "end Foo;"
+edit(36, 36, '   Z : Integer := 2;\n')
+
+try:
+    u.apply_edit(5, 2, '')
+except ValueError as exc:
+    print('ValueError: {}'.format(exc))
+
+# Offsets refer to the whole source buffer, including leading blank lines and
+# trailing whitespace, which are preserved by edits so that the source
+# locations of nodes do not shift.
+u = ctx.get_from_buffer('bar.ads', b"""
+
+package Bar is
+   X : Integer := 1;
+end Bar;
+
+""")
+edit(20, 21, 'Y')
+edit(47, 47, '-- Comment\n')
+print('Buffer: {}'.format(repr(u.export_tokens().source)))
+
+# Edits keep the charset of the unit: later reparsings without an explicit
+# charset still decode the buffer with it.
+u = ctx.get_from_buffer('baz.ads', b"""package Baz is
+   S : String := "\xe9";
+end Baz;
+""", charset='iso-8859-1')
+edit(18, 19, 'T')
+print('Literal: {}'.format(ascii(u.root.find(lal.StrLiteral).text)))
+u.reparse(buffer=b"""package Baz is
+   T : String := "\xe8";
+end Baz;
+""")
+print('Literal after reparse: {}'.format(
+    ascii(u.root.find(lal.StrLiteral).text)
+))
+
+print('Done.')
@@ -0,0 +1,49 @@
+import libadalang as lal
+
+
+src_buffer = b"""--  Leading comment
+procedure Foo is
+   --  Middle comment
+   S : constant String := "Hello, world!";
+begin
+   null;
+end Foo;
+"""
+
+
+for with_trivia in (False, True):
+    print('With trivia: {}'.format(with_trivia))
+    ctx = lal.AnalysisContext(with_trivia=with_trivia)
+    unit = ctx.get_from_buffer('foo.adb', src_buffer)
+    tokens = unit.export_tokens()
+
+    # Iterate on tokens one by one and check that the export yields the same
+    # tokens, in the same order.
+    expected = list(unit.iter_tokens())
+    assert len(tokens) == len(expected)
+
+    for i, tok in enumerate(expected):
+        sloc = tok.sloc_range
+        assert tokens.kind_name(i) == tok.kind
+        assert tokens.text(i) == tok.text
+        assert tokens.is_trivia[i] == int(tok.is_trivia)
+        assert tokens.indexes[i] == tok.index
+        assert (tokens.start_lines[i], tokens.start_columns[i]) == (
+            sloc.start.line, sloc.start.column
+        )
+        assert (tokens.end_lines[i], tokens.end_columns[i]) == (
+            sloc.end.line, sloc.end.column
+        )
+    print('  Export matches the token stream')
+    print('  Comments: {}'.format([
+        tokens.text(i) for i in range(len(tokens))
+        if tokens.kind_name(i) == 'Comment'
+    ]))
+    print('  Source buffer: {}'.format(
+        tokens.source == src_buffer.decode()
+    ))
+    print('  Column item size: {}'.format(
+        memoryview(tokens.start_offsets).itemsize
+    ))
+
+print('Done.')
@@ -0,0 +1,68 @@
+import libadalang as lal
+
+
+src_buffer = b"""
+procedure Foo is
+   type Arr is array (Positive range <>) of Integer;
+begin
+   if Arr'(1, 2)'Length = 2 then
+      null;
+   end if;
+end Foo;
+"""
+
+
+ctx = lal.AnalysisContext()
+unit = ctx.get_from_buffer('foo.adb', src_buffer)
+tree = unit.export_tree()
+
+
+# Walk the tree node by node and check that the export yields the same nodes,
+# in the same order.
+def walk(node, parent_index, nodes):
+    index = len(nodes)
+    nodes.append((node, parent_index))
+    for child in node:
+        if child is not None:
+            walk(child, index, nodes)
+
+
+nodes = []
+walk(unit.root, -1, nodes)
+assert len(tree) == len(nodes)
+
+for i, (node, parent_index) in enumerate(nodes):
+    sloc = node.sloc_range
+    assert tree.node(i) == node
+    assert tree.node_type(i) is type(node)
+    assert tree.parents[i] == parent_index
+    assert tree.first_tokens[i] == node.token_start.index
+    assert tree.last_tokens[i] == (-1 if node.is_ghost
+                                   else node.token_end.index)
+    assert (tree.start_lines[i], tree.start_columns[i]) == (
+        sloc.start.line, sloc.start.column
+    )
+    assert (tree.end_lines[i], tree.end_columns[i]) == (
+        sloc.end.line, sloc.end.column
+    )
+print('Export matches the tree')
+
+# Columns must be usable through the buffer protocol without copies
+view = memoryview(tree.kinds)
+assert len(view) == len(tree)
+print('Column item size: {}'.format(view.itemsize))
+
+# Out of bounds indexes are rejected
+try:
+    tree.node(len(tree))
+except IndexError:
+    print('Out of bounds index: IndexError')
+
+# Nodes cannot be fetched anymore once the unit is reparsed
+unit.reparse(src_buffer.replace(b'Foo', b'Bar'))
+try:
+    tree.node(0)
+except lal.StaleReferenceError:
+    print('After reparse: StaleReferenceError')
+
+print('Done.')
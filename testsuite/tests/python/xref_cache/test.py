@@ -0,0 +1,142 @@
+import os
+import shutil
+import tempfile
+
+import libadalang as lal
+
+
+src_dir = tempfile.mkdtemp()
+cache_dir = tempfile.mkdtemp()
+
+base_file = os.path.join(src_dir, 'base.ads')
+pkg_file = os.path.join(src_dir, 'pkg.ads')
+main_file = os.path.join(src_dir, 'main.adb')
+nested_file = os.path.join(src_dir, 'nested.adb')
+
+
+def write_base(header, max_value, full_view='null record'):
+    with open(base_file, 'w') as f:
+        f.write('{}package Base is\n'
+                '   Max : constant := {};\n'
+                '   type Handle is private;\n'
+                'private\n'
+                '   type Handle is {};\n'
+                'end Base;\n'.format(header, max_value, full_view))
+
+
+def write_nested(name):
+    with open(nested_file, 'w') as f:
+        f.write('procedure Nested is\n'
+                '   package A is\n'
+                '      package B is\n'
+                '         X : Integer := 1;\n'
+                '         W : Integer := 2;\n'
+                '      end B;\n'
+                '   end A;\n'
+                '   Y : Integer := A.B.{};\n'
+                'begin\n'
+                '   null;\n'
+                'end Nested;\n'.format(name))
+
+
+def query_nested(label, cache, unit):
+    refs = []
+    for name in unit.root.findall(lal.DottedName):
+        decl = cache.referenced_decl(name)
+        assert decl == name.p_referenced_decl()
+        refs.append('  {} references {}'.format(name, decl))
+    print('{}: hits={}, misses={}'.format(label, cache.hits, cache.misses))
+    for ref in refs:
+        print(ref)
+
+
+def write_pkg(value):
+    with open(pkg_file, 'w') as f:
+        f.write('with Base;\n'
+                'package Pkg is\n'
+                '   type T is range 1 .. Base.Max;\n'
+                '   X : T := {};\n'
+                'end Pkg;\n'.format(value))
+
+
+def create_cache():
+    ctx = lal.AnalysisContext(
+        unit_provider=lal.UnitProvider.auto([base_file, pkg_file, main_file])
+    )
+    return lal.XrefCache(cache_dir, ctx), ctx.get_from_file(main_file)
+
+
+def query(label):
+    cache, unit = create_cache()
+    name = unit.root.find(lambda n: n.text == 'Pkg.X')
+    decl = cache.referenced_decl(name)
+    typ = cache.expression_type(name)
+    print('{}: hits={}, misses={}'.format(label, cache.hits, cache.misses))
+    print('  {} references {}'.format(name, decl))
+    print('  {} has type {}'.format(name, typ))
+    assert str(decl) == str(name.p_referenced_decl())
+    assert str(typ) == str(name.p_expression_type)
+
+
+write_base('', 10)
+write_pkg(1)
+with open(main_file, 'w') as f:
+    f.write('with Pkg;\n'
+            'procedure Main is\n'
+            '   Y : Pkg.T := Pkg.X;\n'
+            'begin\n'
+            '   null;\n'
+            'end Main;\n')
+
+try:
+    # The first query resolves names in main.adb, the second one uses the
+    # cache.
+    query('First query')
+    query('Second query')
+
+    # Changing a dependency invalidates the cache entry
+    write_pkg(2)
+    query('Modified dependency')
+    query('Last query')
+
+    # Base contains no referenced declaration: changing only its comments
+    # and layout keeps the cache entry.
+    write_base('--  Constants\n\n', 10)
+    query('Comments in indirect dependency')
+
+    write_base('--  Constants\n\n', 20)
+    query('Modified indirect dependency')
+
+    # Main cannot see the private part of Base: changing it keeps the cache
+    # entry too.
+    write_base('--  Constants\n\n', 20, 'range 1 .. 10')
+    query('Private part of indirect dependency')
+
+    # When the same context is used across edits, its units can be older
+    # than the source files on disk: fingerprints must still reflect the
+    # source files.
+    cache, unit = create_cache()
+    name = unit.root.find(lambda n: n.text == 'Pkg.X')
+    cache.referenced_decl(name)
+    cache.context.get_from_file(base_file)
+    write_base('--  Constants\n\n', 30)
+    cache.referenced_decl(name)
+    print('Same context: hits={}, misses={}'.format(cache.hits, cache.misses))
+
+    # Nested names of the same kind can start at the same location: they
+    # must still get their own cache entries. The cache must also notice when
+    # a unit is reparsed.
+    write_nested('X')
+    ctx = lal.AnalysisContext()
+    cache = lal.XrefCache(cache_dir, ctx)
+    query_nested('Nested names', cache, ctx.get_from_file(nested_file))
+
+    write_nested('W')
+    query_nested('Reparsed unit', cache,
+                 ctx.get_from_file(nested_file, reparse=True))
+
+finally:
+    shutil.rmtree(src_dir)
+    shutil.rmtree(cache_dir)
+
+print('Done.')
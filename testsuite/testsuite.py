@@ -23,6 +23,7 @@ from drivers import (
     inline_pg_driver, name_resolution_driver, navigation_driver, ocaml_driver,
     parser_driver, python_driver
 )
+from drivers.valgrind import merge_summaries, read_summaries, write_summaries
 
 
 class LALTestsuite(Testsuite):
@@ -48,6 +49,19 @@ class LALTestsuite(Testsuite):
             '--valgrind', action='store_true',
             help='Run tests within Valgrind to check memory issues.'
         )
+        parser.add_argument(
+            '--valgrind-shard', metavar='I/N',
+            help='With --valgrind, run only the I-th shard (1-based) of the'
+                 ' testcases split in N shards. This allows to split memory'
+                 ' checks over several machines.'
+        )
+        parser.add_argument(
+            '--valgrind-summary', metavar='FILE',
+            help='With --valgrind, write to FILE a JSON summary of the errors'
+                 ' that Valgrind reported, merged across testcases, with'
+                 ' suppression candidates. Summaries for several shards can'
+                 ' be merged with drivers/valgrind.py.'
+        )
         parser.add_argument(
             '--disable-shared', action='store_true',
             help='Disable tests involving shared libraries.'
@@ -67,6 +81,14 @@ class LALTestsuite(Testsuite):
             '--with-python', default='python3',
             help='If provided, use as the Python interpreter in testcases.'
         )
+        parser.add_argument(
+            '--python-workers', action='store_true',
+            help='Run Python scripts in long-lived interpreters, each one'
+                 ' running several testcases, instead of starting one'
+                 ' interpreter per testcase. Testcases whose test.yaml'
+                 ' contains "isolated: true" still run in their own'
+                 ' interpreter.'
+        )
         parser.add_argument(
             '--skip-internal-tests', action='store_true',
             help='Skip tests from the internal testsuite'
@@ -147,9 +169,43 @@ class LALTestsuite(Testsuite):
 
         self.env.rewrite_baselines = opts.rewrite
 
+        # Parse the Valgrind shard specification, if any
+        self.env.valgrind_shard = None
+        if opts.valgrind_shard:
+            try:
+                index, count = [int(n)
+                                for n in opts.valgrind_shard.split('/')]
+            except ValueError:
+                index = count = 0
+            if not 1 <= index <= count:
+                logger.error('Invalid Valgrind shard: {}'
+                             .format(opts.valgrind_shard))
+                raise ValueError(opts.valgrind_shard)
+            self.env.valgrind_shard = (index, count)
+
+        # Directory in which testcases store summaries for the errors that
+        # Valgrind reports.
+        valgrind_errors_dir = os.path.join(self.working_dir, 'valgrind-errors')
+        if os.path.exists(valgrind_errors_dir):
+            shutil.rmtree(valgrind_errors_dir)
+        os.mkdir(valgrind_errors_dir)
+        self.env.valgrind_errors_dir = valgrind_errors_dir
+
     def tear_down(self):
         opts = self.main.args
 
+        python_driver.worker_pool.close()
+
+        # If requested, produce the summary of Valgrind errors
+        if opts.valgrind_summary:
+            write_summaries(opts.valgrind_summary, merge_summaries(
+                summary
+                for filename in sorted(glob.glob(os.path.join(
+                    self.env.valgrind_errors_dir, '*.json'
+                )))
+                for summary in read_summaries(filename)
+            ))
+
         # If requested, produce a coverage report
         if opts.coverage:
             GNATcov().generate_report(